@@ -14,35 +14,319 @@ import numpy as np
 import json
 import os
 import io
+import sys
+import mmap
+import hashlib
+import tempfile
 from typing import Dict, List, Tuple, Optional
 import math
 import re
+import functools
+import operator
 import pandas as pd  # For Excel/CSV import
 
+try:
+    import orjson  # Optional: much faster JSON encode/decode for label files
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional: compact binary label files (.msgpack)
+except ImportError:
+    msgpack = None
+
+# Files larger than this are memory-mapped and parsed in place instead of read()
+MMAP_THRESHOLD = 64 * 1024
+
+# Number embedded in label text (e.g. "Sales: -1234.5"), compiled once per process
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+# Rule operator string -> comparison function (resolved once per ColorRule operator)
+_OP_MAP = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Mapping dialog option text ("Row 12: <preview>") -> spreadsheet row number
+_ROW_OPTION_RE = re.compile(r'Row (\d+):')
+
+# First characters that can begin a _NUMBER_RE match
+_NUMBER_START_CHARS = frozenset('-0123456789')
+
+# Currency symbols and thousands separators stripped before number extraction (one translate
+# pass); the symbols must go too, or the sign in "-$1,234" is separated from its digits
+_CURRENCY_STRIP = str.maketrans('', '', '$,฿€£')
+
+# Export bounding boxes with more entries than this are reduced with NumPy
+NUMPY_BBOX_THRESHOLD = 256
+
+# Export leader arrowhead geometry (30 degree half-angle, 10px long)
+_ARROW_SIZE = 10
+_ARROW_COS = math.cos(math.pi / 6)
+_ARROW_SIN = math.sin(math.pi / 6)
+
+
+def _read_json_file(file_path: str):
+    """Read and parse a JSON file, using orjson when it is available"""
+    if orjson is not None:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return orjson.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_bytes(file_path: str, buf: bytes) -> None:
+    """Write an encoded buffer to a file with a single os.write loop"""
+    # Hand the whole encoded blob to the OS instead of going through a buffered text file
+    # (O_BINARY only exists on Windows and stops newline translation there)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(file_path, flags, 0o644)
+    try:
+        view = memoryview(buf)
+        while view:
+            # os.write may write fewer bytes than requested
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_json_file(file_path: str, data) -> None:
+    """Write data to a JSON file (indented), using orjson when it is available"""
+    if orjson is not None:
+        buf = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        buf = json.dumps(data, indent=2).encode('utf-8')
+    _write_bytes(file_path, buf)
+
+
+def _is_msgpack_path(file_path: str) -> bool:
+    """Label files saved with a .msgpack extension use the binary format"""
+    return file_path.lower().endswith('.msgpack')
+
+
+def _read_label_file(file_path: str):
+    """Read a label file: MessagePack for .msgpack paths, JSON otherwise"""
+    if _is_msgpack_path(file_path):
+        if msgpack is None:
+            raise ImportError("Reading .msgpack label files requires the 'msgpack' package")
+        with open(file_path, 'rb') as f:
+            return msgpack.unpackb(f.read(), raw=False)
+    return _read_json_file(file_path)
+
+
+def _write_label_file(file_path: str, data) -> None:
+    """Write a label file: MessagePack for .msgpack paths, JSON otherwise"""
+    if _is_msgpack_path(file_path):
+        if msgpack is None:
+            raise ImportError("Saving .msgpack label files requires the 'msgpack' package")
+        _write_bytes(file_path, msgpack.packb(data, use_bin_type=True))
+        return
+    _write_json_file(file_path, data)
+
+
+def _label_filetypes() -> List[Tuple[str, str]]:
+    """File dialog types for label files (MessagePack only offered when installed)"""
+    filetypes = [("JSON files", "*.json")]
+    if msgpack is not None:
+        filetypes.append(("MessagePack files", "*.msgpack"))
+    filetypes.append(("All files", "*.*"))
+    return filetypes
+
+
+@functools.lru_cache(maxsize=1)
+def _render_pdf_first_page(file_path: str, mtime: float) -> Optional[Image.Image]:
+    """Rasterize the first page of a PDF at 150 DPI (None if the PDF has no pages)
+    
+    Memoized on (path, mtime) so reopening an unchanged PDF (e.g. when switching
+    tabs in the combined app) skips MuPDF; callers must treat the image as read-only.
+    Only the current page is kept (a raster can be tens of MB); cleared on close/replace.
+    """
+    doc = fitz.open(file_path)
+    try:
+        if len(doc) == 0:
+            return None
+        
+        # Convert first page to image (high resolution)
+        mat = fitz.Matrix(150/72, 150/72)
+        pix = doc[0].get_pixmap(matrix=mat)
+        
+        # Convert to PIL Image (loaded now, so it doesn't hold on to the PPM buffer lazily)
+        image = Image.open(io.BytesIO(pix.tobytes("ppm")))
+        image.load()
+        return image
+    finally:
+        doc.close()
+
+
+# Parquet copies of imported Excel sheets live in the temp dir, never next to the user's files
+_TABLE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "layout_heatmap_table_cache")
+
+
+def _read_excel_cached(file_path: str, mtime: float, size: int) -> pd.DataFrame:
+    """Read an Excel sheet, reusing its Parquet copy from the cache dir when one exists
+    
+    The copy is named after the source path, mtime and size, so a different workbook
+    restored to the same path (even with an older timestamp) never hits a stale copy.
+    """
+    abs_path = os.path.abspath(file_path)
+    path_hash = hashlib.sha1(abs_path.encode("utf-8")).hexdigest()
+    key_hash = hashlib.sha1(f"{abs_path}|{mtime}|{size}".encode("utf-8")).hexdigest()
+    cache_path = os.path.join(_TABLE_CACHE_DIR, f"{path_hash}-{key_hash}.parquet")
+    try:
+        return pd.read_parquet(cache_path)
+    except (OSError, ImportError, ValueError):
+        pass  # No usable cache (missing, stale format, or no Parquet engine installed)
+    
+    try:
+        df = pd.read_excel(file_path, dtype=str, engine="calamine")  # Rust parser, much faster than openpyxl
+    except (ImportError, ValueError):
+        df = pd.read_excel(file_path, dtype=str)  # python-calamine missing or pandas too old for it
+    try:
+        os.makedirs(_TABLE_CACHE_DIR, exist_ok=True)
+        # Drop copies of earlier versions of this file before writing the current one
+        for name in os.listdir(_TABLE_CACHE_DIR):
+            if name.startswith(path_hash + "-"):
+                os.remove(os.path.join(_TABLE_CACHE_DIR, name))
+        df.to_parquet(cache_path)
+    except (OSError, ImportError, ValueError, TypeError):
+        pass  # Caching is best effort (unwritable temp dir, no pyarrow, non-string headers)
+    return df
+
+
+@functools.lru_cache(maxsize=2)
+def _read_table_cached(file_path: str, mtime: float, size: int) -> pd.DataFrame:
+    """Parse an import table, memoized on (path, mtime, size); only the last two tables are kept"""
+    if file_path.lower().endswith('.csv'):
+        try:
+            df = pd.read_csv(file_path, dtype=str, engine="pyarrow")  # Multithreaded C++ parser
+        except Exception:
+            # pyarrow missing, or stricter than the C parser about ragged rows, quoting
+            # and encoding (ArrowInvalid etc.): retry with the default engine
+            df = pd.read_csv(file_path, dtype=str)
+    else:
+        df = _read_excel_cached(file_path, mtime, size)
+    
+    # Parquet and pyarrow give None for blank cells where the default readers give NaN;
+    # normalize so a blank cell imports the same whichever path read the file
+    return df.where(df.notna(), np.nan)
+
+
+def _read_table_file(file_path: str) -> pd.DataFrame:
+    """Read an import table (.csv/.xlsx/.xls) using the in-memory and on-disk caches
+    
+    Every column is read as text: the import only ever str()s cells and parses
+    numbers itself, so pandas' per-column type inference is wasted work (and turns
+    integer columns with blanks into "123.0").
+    """
+    stat = os.stat(file_path)
+    return _read_table_cached(os.path.abspath(file_path), stat.st_mtime, stat.st_size)
+
+
+# Regular export font candidates, in order of preference
+EXPORT_FONT_CANDIDATES = [
+    "arial.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+def _probe_font(candidates: List[str]) -> Optional[str]:
+    """Return the first font path that PIL can load, or None if none of them load"""
+    for path in candidates:
+        try:
+            ImageFont.truetype(path, 12)
+            return path
+        except OSError:
+            continue
+    return None
+
+
+def _intern(value):
+    """sys.intern for plain strings; anything else (e.g. None) is returned unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@functools.lru_cache(maxsize=None)
+def _unit_symbol(unit_str: str) -> str:
+    """Extract just the unit symbol (e.g., "m²" from "m² (Square Meter)"), memoized per unit string"""
+    return unit_str.split("(")[0].strip() if "(" in unit_str else unit_str
+
+
+@functools.lru_cache(maxsize=64)
+def _hex_to_rgb(color_hex: str) -> Tuple[int, int, int]:
+    """Convert "#RRGGBB" to an (r, g, b) tuple, memoized since shapes share a handful of colors"""
+    h = color_hex.lstrip('#')
+    return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_number(text: str) -> Optional[float]:
+    """Extract a number from text string (pure, so memoized on the raw text)"""
+    if not text:
+        return None
+    
+    # Fast path: no digits at all means no number
+    if not any(c.isdigit() for c in text):
+        return None
+    
+    # Fast path: the line is already a plain decimal like "123", "-3.14" or ".5"
+    # (checked with string ops, so neither the regex nor a float() exception is involved)
+    s = text.strip()
+    t = s[1:] if s[:1] in ('+', '-') else s
+    whole, dot, frac = t.partition('.')
+    if ((whole or frac)
+            and (not whole or (whole.isascii() and whole.isdigit()))
+            and (not frac or (frac.isascii() and frac.isdigit()))):
+        return float(s)
+    
+    # Remove common currency symbols and commas
+    cleaned = text.translate(_CURRENCY_STRIP)
+    
+    # Text that starts like a number (e.g. "1234 m²") matches anchored at the start; only
+    # lines with a prefix (e.g. "Sales: 1234") need the scanning search
+    stripped = cleaned.lstrip()
+    match = None
+    if stripped[:1] in _NUMBER_START_CHARS:
+        match = _NUMBER_RE.match(stripped)
+    if match is None:
+        match = _NUMBER_RE.search(cleaned)
+    if match:
+        try:
+            return float(match.group())
+        except ValueError:
+            return None
+    return None
 
 
 class ColorRule:
     """Represents a conditional coloring rule"""
     def __init__(self, operator: str = ">", threshold: float = 0, color: str = "#FF0000"):
+        # Operators and colors are interned so comparisons and dict lookups on them stay cheap
         self.operator = operator  # ">", ">=", "<", "<=", "==", "!="
         self.threshold = threshold
-        self.color = color
+        self.color = _intern(color)
+    
+    @property
+    def operator(self) -> str:
+        return self._operator
+    
+    @operator.setter
+    def operator(self, value: str):
+        # Resolve the comparison function once instead of dispatching on the string per evaluate
+        self._operator = _intern(value)
+        self._op = _OP_MAP.get(value)
     
     def evaluate(self, value: float) -> bool:
         """Check if value meets this rule's condition"""
-        if self.operator == ">":
-            return value > self.threshold
-        elif self.operator == ">=":
-            return value >= self.threshold
-        elif self.operator == "<":
-            return value < self.threshold
-        elif self.operator == "<=":
-            return value <= self.threshold
-        elif self.operator == "==":
-            return value == self.threshold
-        elif self.operator == "!=":
-            return value != self.threshold
-        return False
+        return self._op is not None and self._op(value, self.threshold)
 
 
 class Variable:
@@ -95,6 +379,28 @@ class Variable:
         
         # Return color of the most specific rule (smallest distance)
         return matching_rules[0][0].color
+    
+    def evaluate_many(self, values: np.ndarray) -> List[Optional[str]]:
+        """Vectorized evaluate(): one color (or None) per value, NaN never matches
+        
+        Each rule is tested against the whole array at once; ties on distance go
+        to the earliest rule, same as the stable sort in evaluate().
+        """
+        values = np.asarray(values, dtype=np.float64)
+        rules = [rule for rule in self.rules if rule._op is not None]
+        if not rules or values.size == 0:
+            return [None] * values.size
+        
+        distances = np.full((len(rules), values.size), np.inf)
+        with np.errstate(invalid='ignore'):
+            for i, rule in enumerate(rules):
+                mask = rule._op(values, rule.threshold)
+                distances[i, mask] = np.abs(values[mask] - rule.threshold)
+        
+        best = distances.argmin(axis=0)
+        matched = np.isfinite(distances[best, np.arange(values.size)])
+        colors = [rule.color for rule in rules]
+        return [colors[b] if m else None for b, m in zip(best.tolist(), matched.tolist())]
 
 
 
@@ -130,9 +436,61 @@ class TextLabel:
         self.additional_target_shapes = []  # List of shape indices to draw leader lines to
         self.additional_leader_points = []  # List of leader point arrays, one per additional target
         self.canvas_additional_leader_ids = []  # Canvas IDs for additional leader lines
+    
+    @classmethod
+    def from_dict(cls, label_data: Dict) -> 'TextLabel':
+        """Build a label from its saved JSON dict (fills defaults for older file formats)"""
+        label = cls(label_data["shape_index"], tuple(label_data["position"]))
+        label.text_lines = label_data.get("text_lines", [""])
+        
+        # Load per-line formatting (new format)
+        if "line_font_sizes" in label_data:
+            label.line_font_sizes = label_data["line_font_sizes"]
+        else:
+            # Backward compatibility: convert old single font_size to array
+            font_size = label_data.get("font_size", 12)
+            label.line_font_sizes = [font_size] * len(label.text_lines)
+        
+        if "line_font_colors" in label_data:
+            label.line_font_colors = label_data["line_font_colors"]
+        else:
+            # Backward compatibility: convert old single font_color to array
+            font_color = label_data.get("font_color", "#000000")
+            label.line_font_colors = [font_color] * len(label.text_lines)
+        
+        if "line_bg_colors" in label_data:
+            label.line_bg_colors = label_data["line_bg_colors"]
+        else:
+            # Default background color for all lines
+            label.line_bg_colors = ["#FFFFFF"] * len(label.text_lines)
+        
+        if "line_variables" in label_data:
+            label.line_variables = label_data["line_variables"]
+        else:
+            # Default: no variable assignment for all lines
+            label.line_variables = ["None"] * len(label.text_lines)
+        
+        label.has_leader = label_data.get("has_leader", False)
+        label.leader_points = label_data.get("leader_points", [])
+        
+        # Load leader line styling properties (with defaults for backward compatibility)
+        label.leader_style = label_data.get("leader_style", "solid")
+        label.leader_width = label_data.get("leader_width", 2)
+        label.leader_color = label_data.get("leader_color", "#666666")
+        
+        # Load visibility properties (with defaults for backward compatibility)
+        label.text_visible = label_data.get("text_visible", True)
+        label.leader_visible = label_data.get("leader_visible", True)
+        
+        return label
 
 
 class LayoutTextLabeler:
+    # Shared by the create/edit variable dialogs and the rule widgets
+    UNIT_OPTIONS = ("None", "m² (Square Meter)", "m³ (Cubic Meter)", "ft² (Square Feet)",
+                    "ft³ (Cubic Feet)", "ha (Hectare)", "acre")
+    RULE_OPERATORS = (">", ">=", "<", "<=", "==", "!=")
+    
     def __init__(self, parent):
         # Parent can be either root window or a frame
         self.root = parent
@@ -176,6 +534,26 @@ class LayoutTextLabeler:
         self.max_undo_steps = 20  # Maximum number of undo steps to keep
         self.redo_stack = []  # Stack to store states for redo
         
+        # Display caches: (zoom, source pdf image, resized image) and (shapes signature, composited image)
+        self._base_cache = None
+        self._shapes_cache = None
+        
+        # Mouse-wheel zoom debouncing (see zoom_canvas)
+        self._pending_zoom: Optional[float] = None
+        self._zoom_after_id = None
+        
+        # Batch updates request one idle-time display_canvas() (see _schedule_redraw)
+        self._redraw_pending = False
+        
+        # Export font paths resolved once: font file name -> loadable path (None = PIL default font)
+        self._font_path: Optional[str] = _probe_font(EXPORT_FONT_CANDIDATES)
+        self._font_paths: Dict[str, Optional[str]] = {"arial.ttf": self._font_path}
+        
+        # Export font cache: (font file name, size) -> loaded PIL font
+        self._font_cache: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        # Export line height cache: loaded PIL font -> ascent + descent
+        self._line_height_cache: Dict[ImageFont.ImageFont, int] = {}
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -689,27 +1067,24 @@ class LayoutTextLabeler:
     def load_pdf_internal(self, file_path):
         """Internal method to load a PDF file from a given path"""
         try:
+            # A different PDF replaces the current one, so drop the cached raster of the old page
+            if self.current_pdf_path and os.path.abspath(self.current_pdf_path) != os.path.abspath(file_path):
+                _render_pdf_first_page.cache_clear()
+                self._base_cache = None
+                self._shapes_cache = None
+            
             self.current_pdf_path = file_path
             
-            # Open PDF with PyMuPDF
-            doc = fitz.open(file_path)
+            # Render first page with PyMuPDF (cached per path and modification time)
+            pdf_image = _render_pdf_first_page(os.path.abspath(file_path), os.path.getmtime(file_path))
             
-            if len(doc) == 0:
+            if pdf_image is None:
                 messagebox.showerror("Error", "PDF file appears to be empty")
                 return
             
-            # Get first page
-            page = doc[0]
-            
-            # Convert to image (high resolution)
-            mat = fitz.Matrix(150/72, 150/72)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PIL Image
-            img_data = pix.tobytes("ppm")
-            self.pdf_image = Image.open(io.BytesIO(img_data))
-            
-            doc.close()
+            self.pdf_image = pdf_image
+            self._base_cache = None  # Zoomed copies of the previous page
+            self._shapes_cache = None
             
             # Reset zoom and display
             self.zoom_factor = 1.0
@@ -758,27 +1133,56 @@ class LayoutTextLabeler:
         json_name = os.path.basename(self.current_json_path) if self.current_json_path else "None"
         self.file_info_var.set(f"PDF: {pdf_name} | Shapes: {json_name}")
     
-    def update_shape_list(self):
-        """Update the shape listbox"""
-        self.shape_listbox.delete(0, tk.END)
+    def update_shape_list(self, dirty_shape_indices=None):
+        """Update the shape listbox
         
-        for i, shape in enumerate(self.shapes):
+        With dirty_shape_indices, only those rows are rewritten (when the listbox
+        already has one row per shape); otherwise the whole list is rebuilt.
+        """
+        # Shape index -> first label with text (reversed so the first one wins)
+        label_by_shape = {label.shape_index: label for label in reversed(self.labels) if label.text_lines}
+        
+        def row_text(i, shape):
             # Find if this shape has a label
             display_text = None
-            for label in self.labels:
-                if label.shape_index == i and label.text_lines:
-                    # Show the first line of mapped label text as the identifier
-                    non_empty_lines = [line for line in label.text_lines if line.strip()]
-                    if non_empty_lines:
-                        display_text = non_empty_lines[0]  # Just show first line
-                    break
+            label = label_by_shape.get(i)
+            if label is not None:
+                # Show the first line of mapped label text as the identifier
+                non_empty_lines = [line for line in label.text_lines if line.strip()]
+                if non_empty_lines:
+                    display_text = non_empty_lines[0]  # Just show first line
             
             # If no label, fall back to shape name
             if not display_text:
                 shape_name = shape.get("name", f"Shape {i+1}")
                 display_text = f"{shape_name} (no label)"
-            
-            self.shape_listbox.insert(tk.END, display_text)
+            return display_text
+        
+        if dirty_shape_indices is not None and self.shape_listbox.size() == len(self.shapes):
+            listbox = self.shape_listbox
+            
+            # Deleting a row drops its selection/active state, so remember them and the scroll position
+            selected = set(listbox.curselection())
+            active = listbox.index(tk.ACTIVE)
+            top = listbox.yview()[0]
+            
+            for i in sorted(dirty_shape_indices):
+                if 0 <= i < len(self.shapes):
+                    text = row_text(i, self.shapes[i])
+                    if listbox.get(i) == text:
+                        continue  # Unchanged row keeps its state as is
+                    listbox.delete(i)
+                    listbox.insert(i, text)
+                    if i in selected:
+                        listbox.selection_set(i)
+            
+            listbox.activate(active)
+            listbox.yview_moveto(top)
+            return
+        
+        self.shape_listbox.delete(0, tk.END)
+        for i, shape in enumerate(self.shapes):
+            self.shape_listbox.insert(tk.END, row_text(i, shape))
     
     def on_shape_select(self, event):
         """Handle shape selection from listbox"""
@@ -1184,11 +1588,7 @@ class LayoutTextLabeler:
                         has_auto_sales = True
                         if var.default_unit != "None":
                             # Extract unit symbol
-                            unit_str = var.default_unit
-                            if "(" in unit_str:
-                                unit_to_append = unit_str.split("(")[0].strip()
-                            else:
-                                unit_to_append = unit_str
+                            unit_to_append = _unit_symbol(var.default_unit)
                         break
             
             # Append unit to text if variable has auto-enable sales
@@ -1255,11 +1655,7 @@ class LayoutTextLabeler:
                             # Extract unit symbol
                             unit_to_append = None
                             if var.default_unit != "None":
-                                unit_str = var.default_unit
-                                if "(" in unit_str:
-                                    unit_to_append = unit_str.split("(")[0].strip()
-                                else:
-                                    unit_to_append = unit_str
+                                unit_to_append = _unit_symbol(var.default_unit)
                             
                             # Append unit to text if not already there
                             if unit_to_append:
@@ -1548,6 +1944,9 @@ class LayoutTextLabeler:
         self.current_json_path = None
         self.pdf_image = None
         self.canvas_image = None
+        self._base_cache = None  # Drop the zoomed page and shapes composite so the raster is freed
+        self._shapes_cache = None
+        _render_pdf_first_page.cache_clear()  # Release the cached page raster too
         self.shapes.clear()
         self.labels.clear()
         self.selected_label = None
@@ -1573,6 +1972,17 @@ class LayoutTextLabeler:
         
         messagebox.showinfo("New File", "All data cleared. Ready to start fresh!")
     
+    def _schedule_redraw(self):
+        """Request a display_canvas() on the next idle cycle (repeated requests coalesce)"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._do_redraw)
+    
+    def _do_redraw(self):
+        """Run the redraw requested by _schedule_redraw"""
+        self._redraw_pending = False
+        self.display_canvas()
+    
     def display_canvas(self):
         """Display PDF, shapes, and labels on canvas"""
         if not self.pdf_image:
@@ -1590,15 +2000,26 @@ class LayoutTextLabeler:
         new_width = int(original_width * self.zoom_factor)
         new_height = int(original_height * self.zoom_factor)
         
-        # Resize image
-        if self.zoom_factor != 1.0:
-            display_image = self.pdf_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # Resize image (cached per PDF image and zoom so pans/redraws skip the LANCZOS pass)
+        cache = self._base_cache
+        if cache is not None and cache[0] == self.zoom_factor and cache[1] is self.pdf_image:
+            display_image = cache[2]
         else:
-            display_image = self.pdf_image.copy()
+            if self.zoom_factor != 1.0:
+                display_image = self.pdf_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            else:
+                display_image = self.pdf_image.copy()
+            self._base_cache = (self.zoom_factor, self.pdf_image, display_image)
+            self._shapes_cache = None
         
-        # Draw shapes on image (semi-transparent)
+        # Draw shapes on image (semi-transparent); reuse the composite while nothing it depends on changed
         if self.shapes:
-            display_image = self.draw_shapes_on_image(display_image)
+            signature = self._shapes_layer_signature()
+            if self._shapes_cache is not None and self._shapes_cache[0] == signature:
+                display_image = self._shapes_cache[1]
+            else:
+                display_image = self.draw_shapes_on_image(display_image)
+                self._shapes_cache = (signature, display_image)
         
         # Convert to PhotoImage and display
         self.canvas_image = ImageTk.PhotoImage(display_image)
@@ -1613,12 +2034,23 @@ class LayoutTextLabeler:
         # Update scroll region
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
+    def _shapes_layer_signature(self) -> tuple:
+        """Snapshot of everything draw_shapes_on_image reads, used as the shapes-layer cache key"""
+        return (
+            tuple((shape.get("type"), tuple(shape["coordinates"]), shape.get("color")) for shape in self.shapes),
+            tuple((label.shape_index, tuple(label.text_lines), tuple(label.line_variables)) for label in self.labels),
+            tuple((v.name, tuple((r.operator, r.threshold, r.color) for r in v.rules)) for v in self.variables),
+        )
+    
     def draw_shapes_on_image(self, image: Image.Image) -> Image.Image:
         """Draw shapes on the image with semi-transparency"""
         # Create RGBA overlay
         overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
         draw = ImageDraw.Draw(overlay)
         
+        # Shape index -> its (first) label, instead of a label scan per shape
+        label_by_shape = {label.shape_index: label for label in reversed(self.labels)}
+        
         for idx, shape in enumerate(self.shapes):
             try:
                 coords = shape["coordinates"]
@@ -1626,7 +2058,7 @@ class LayoutTextLabeler:
                 shape_type = shape.get("type", "rectangle")
                 
                 # Check if this shape has a label with variable assignment
-                label = self.find_label_for_shape(idx)
+                label = label_by_shape.get(idx)
                 if label:
                     # Check each text line for variable assignments
                     for i, text_line in enumerate(label.text_lines):
@@ -1642,25 +2074,17 @@ class LayoutTextLabeler:
                                         break
                                 
                                 if variable:
-                                    # Extract numeric value from text
-                                    try:
-                                        # Remove commas and extract numbers
-                                        cleaned_text = text_line.replace(',', '').strip()
-                                        # Try to find a number in the text
-                                        import re
-                                        numbers = re.findall(r'-?\d+\.?\d*', cleaned_text)
-                                        if numbers:
-                                            value = float(numbers[0])
-                                            # Evaluate variable rules to get color
-                                            conditional_color = variable.evaluate(value)
-                                            if conditional_color:
-                                                color_hex = conditional_color
-                                                break  # Use first matching variable
-                                    except (ValueError, IndexError):
-                                        pass  # Keep default color if parsing fails
+                                    # Extract numeric value from text (same parser as apply_variable_colors)
+                                    value = _extract_number(text_line)
+                                    if value is not None:
+                                        # Evaluate variable rules to get color
+                                        conditional_color = variable.evaluate(value)
+                                        if conditional_color:
+                                            color_hex = conditional_color
+                                            break  # Use first matching variable
                 
                 # Convert hex to RGB and add alpha
-                color_rgb = tuple(int(color_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+                color_rgb = _hex_to_rgb(color_hex)
                 color_rgba = color_rgb + (80,)  # 80/255 = ~30% opacity
                 
                 if shape_type == "rectangle":
@@ -2020,9 +2444,10 @@ class LayoutTextLabeler:
         elif shape_type == "circle":
             # Circle coordinates: [cx, cy, radius]
             cx, cy, radius = coords
-            # Check if point is within radius
-            distance = math.sqrt((x - cx)**2 + (y - cy)**2)
-            return distance <= radius
+            # Check if point is within radius (compare squared distances)
+            dx = x - cx
+            dy = y - cy
+            return dx * dx + dy * dy <= radius * radius
         
         return False
     
@@ -2094,7 +2519,7 @@ class LayoutTextLabeler:
         elif shape_type == "polygon":
             # Find nearest point on polygon edges
             points = [(coords[i], coords[i+1]) for i in range(0, len(coords), 2)]
-            min_dist = float('inf')
+            min_d2 = float('inf')
             nearest = None
             
             for i in range(len(points)):
@@ -2103,10 +2528,13 @@ class LayoutTextLabeler:
                 
                 # Find nearest point on line segment
                 nearest_on_segment = self.nearest_point_on_segment(point, p1, p2)
-                dist = math.sqrt((nearest_on_segment[0] - x)**2 + (nearest_on_segment[1] - y)**2)
+                # Squared distance is enough to rank candidates (sqrt is monotonic)
+                nx = nearest_on_segment[0] - x
+                ny = nearest_on_segment[1] - y
+                d2 = nx * nx + ny * ny
                 
-                if dist < min_dist:
-                    min_dist = dist
+                if d2 < min_d2:
+                    min_d2 = d2
                     nearest = nearest_on_segment
             
             return nearest
@@ -2139,7 +2567,7 @@ class LayoutTextLabeler:
             # Calculate angle from center to point
             dx = x - cx
             dy = y - cy
-            distance = math.sqrt(dx**2 + dy**2)
+            distance = math.hypot(dx, dy)
             
             if distance == 0:
                 # Point is at center, return any point on circle
@@ -2240,12 +2668,8 @@ class LayoutTextLabeler:
         coords = shape["coordinates"]
         shape_type = shape.get("type", "rectangle")
         
-        # Scale coordinates for current zoom
-        scaled_coords = [c * self.zoom_factor for c in coords]
-        
-        # Offset for canvas position
-        offset_coords = [scaled_coords[i] + 10 if i % 2 == 0 else scaled_coords[i] + 10 
-                        for i in range(len(scaled_coords))]
+        # Scale for current zoom and offset for canvas position in one vector op
+        offset_coords = self._img2canvas_vec(np.asarray(coords, dtype=np.float64)).tolist()
         
         # Simple clean red highlight - 5px thick
         glow_layers = [
@@ -2265,12 +2689,9 @@ class LayoutTextLabeler:
                     tags="shape_highlight"
                 )
             elif shape_type == "polygon":
-                points = [(shadow_coords[i], shadow_coords[i+1]) 
-                         for i in range(0, len(shadow_coords), 2)]
-                # Flatten points for canvas.create_polygon
-                flat_points = [coord for point in points for coord in point]
+                # shadow_coords is already flat [x1, y1, x2, y2, ...] as create_polygon expects
                 self.canvas.create_polygon(
-                    flat_points,
+                    shadow_coords,
                     outline=layer["color"],
                     fill="",
                     width=layer["width"],
@@ -2356,11 +2777,23 @@ class LayoutTextLabeler:
         self.canvas.config(cursor="")
     
     def zoom_canvas(self, event):
-        """Zoom canvas with mouse wheel"""
-        if event.delta > 0:
-            self.zoom_in()
-        else:
-            self.zoom_out()
+        """Zoom canvas with mouse wheel (coalesces rapid wheel ticks into one redraw per frame)"""
+        base = self._pending_zoom if self._pending_zoom is not None else self.zoom_factor
+        # Clamp on every tick so a fast scroll can't run the pending zoom past the limit
+        self._pending_zoom = base * 1.25 if event.delta > 0 else max(base / 1.25, 0.1)
+        
+        if self._zoom_after_id is None:
+            self._zoom_after_id = self.canvas.after(16, self._flush_zoom)
+    
+    def _flush_zoom(self):
+        """Apply the zoom accumulated by zoom_canvas and redraw once"""
+        self._zoom_after_id = None
+        if self._pending_zoom is None:
+            return
+        
+        self.zoom_factor = self._pending_zoom
+        self._pending_zoom = None
+        self.update_zoom()
     
     def zoom_in(self):
         """Zoom in"""
@@ -2393,6 +2826,10 @@ class LayoutTextLabeler:
     
     def update_zoom(self):
         """Update zoom display"""
+        # Drop cached layers rendered at a different zoom
+        if self._base_cache is not None and self._base_cache[0] != self.zoom_factor:
+            self._base_cache = None
+            self._shapes_cache = None
         self.zoom_var.set(f"Zoom: {int(self.zoom_factor * 100)}%")
         self.display_canvas()
     
@@ -2408,6 +2845,10 @@ class LayoutTextLabeler:
         img_y = (canvas_y - 10) / self.zoom_factor
         return (img_x, img_y)
     
+    def _img2canvas_vec(self, pts: np.ndarray) -> np.ndarray:
+        """Vector form of image_to_canvas_coords for arrays of coordinates"""
+        return pts * self.zoom_factor + 10.0
+    
     def save_labels(self):
         """Save labels to JSON file"""
         if not self.labels:
@@ -2417,7 +2858,7 @@ class LayoutTextLabeler:
         file_path = filedialog.asksaveasfilename(
             title="Save Labels",
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=_label_filetypes()
         )
         
         if file_path:
@@ -2446,8 +2887,7 @@ class LayoutTextLabeler:
                     ]
                 }
                 
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                _write_label_file(file_path, data)
                 
                 messagebox.showinfo("Success", "Labels saved successfully")
                 self.status_var.set(f"Labels saved to {os.path.basename(file_path)}")
@@ -2459,13 +2899,12 @@ class LayoutTextLabeler:
         """Load labels from JSON file"""
         file_path = filedialog.askopenfilename(
             title="Load Labels",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            filetypes=_label_filetypes()
         )
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                data = _read_label_file(file_path)
                 
                 # Validate that PDF and shapes are loaded
                 if not self.pdf_image:
@@ -2525,51 +2964,7 @@ class LayoutTextLabeler:
                             continue
                         
                         # Create label
-                        label = TextLabel(
-                            shape_index,
-                            tuple(label_data["position"])
-                        )
-                        label.text_lines = label_data.get("text_lines", [""])
-                        
-                        # Load per-line formatting (new format)
-                        if "line_font_sizes" in label_data:
-                            label.line_font_sizes = label_data["line_font_sizes"]
-                        else:
-                            # Backward compatibility: convert old single font_size to array
-                            font_size = label_data.get("font_size", 12)
-                            label.line_font_sizes = [font_size] * len(label.text_lines)
-                        
-                        if "line_font_colors" in label_data:
-                            label.line_font_colors = label_data["line_font_colors"]
-                        else:
-                            # Backward compatibility: convert old single font_color to array
-                            font_color = label_data.get("font_color", "#000000")
-                            label.line_font_colors = [font_color] * len(label.text_lines)
-                        
-                        if "line_bg_colors" in label_data:
-                            label.line_bg_colors = label_data["line_bg_colors"]
-                        else:
-                            # Default background color for all lines
-                            label.line_bg_colors = ["#FFFFFF"] * len(label.text_lines)
-                        
-                        if "line_variables" in label_data:
-                            label.line_variables = label_data["line_variables"]
-                        else:
-                            # Default: no variable assignment for all lines
-                            label.line_variables = ["None"] * len(label.text_lines)
-                        
-                        label.has_leader = label_data.get("has_leader", False)
-                        label.leader_points = label_data.get("leader_points", [])
-                        
-                        # Load leader line styling properties (with defaults for backward compatibility)
-                        label.leader_style = label_data.get("leader_style", "solid")
-                        label.leader_width = label_data.get("leader_width", 2)
-                        label.leader_color = label_data.get("leader_color", "#666666")
-                        
-                        # Load visibility properties (with defaults for backward compatibility)
-                        label.text_visible = label_data.get("text_visible", True)
-                        label.leader_visible = label_data.get("leader_visible", True)
-                        
+                        label = TextLabel.from_dict(label_data)
                         self.labels.append(label)
                         loaded_count += 1
                         
@@ -2587,7 +2982,7 @@ class LayoutTextLabeler:
                 )
                 self.status_var.set(f"Loaded {loaded_count} labels from {os.path.basename(file_path)}")
                 
-            except json.JSONDecodeError as e:
+            except json.JSONDecodeError as e:  # orjson.JSONDecodeError is a subclass
                 messagebox.showerror(
                     "Error", 
                     f"Invalid JSON file: {str(e)}\n\nPlease check the file format."
@@ -2629,67 +3024,59 @@ class LayoutTextLabeler:
                 min_x, min_y = 0, 0
                 max_x, max_y = pdf_width, pdf_height
                 
-                # Expand bounding box to include all labels
-                for label in self.labels:
-                    text_lines = [line for line in label.text_lines if line.strip()]
-                    if text_lines:
+                # Skip placeholder labels (no text and no leader) for both sizing and drawing
+                active_labels = [
+                    label for label in self.labels
+                    if any(line.strip() for line in label.text_lines) or (label.has_leader and label.leader_points)
+                ]
+                
+                # Measure every label once; draw_labels_on_export reuses these
+                if active_labels:
+                    temp_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+                    measurements = [self._measure_label_for_export(label, temp_draw) for label in active_labels]
+                else:
+                    measurements = []
+                
+                # Collect label boxes (x1, y1, x2, y2) and leader points, then reduce once
+                boxes = []
+                pts = []
+                for label, measurement in zip(active_labels, measurements):
+                    if measurement:
                         x, y = label.position
-                        
-                        # Estimate label box size (MUST match draw_labels_on_export calculation)
-                        padding_x = 15  # Must match actual drawing code
-                        padding_y = 8   # Must match actual drawing code
-                        
-                        # Create temporary draw to measure text
-                        temp_img = Image.new('RGB', (1, 1))
-                        temp_draw = ImageDraw.Draw(temp_img)
-                        
-                        try:
-                            line_widths = []
-                            line_heights = []
-                            for i, line in enumerate(text_lines):
-                                # Get per-line font size
-                                if i < len(label.line_font_sizes):
-                                    font_size = label.line_font_sizes[i]
-                                else:
-                                    font_size = 12
-                                
-                                try:
-                                    custom_font = ImageFont.truetype("arial.ttf", font_size)
-                                except:
-                                    try:
-                                        custom_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-                                    except:
-                                        custom_font = ImageFont.load_default()
-                                
-                                bbox = temp_draw.textbbox((0, 0), line, font=custom_font)
-                                text_width = bbox[2] - bbox[0]
-                                # Add 10% safety margin (matching actual drawing)
-                                line_widths.append(int(text_width * 1.1))
-                                line_heights.append(bbox[3] - bbox[1])
-                            
-                            max_width = max(line_widths) if line_widths else 0
-                            # Calculate total height (boxes stacked with no gaps)
-                            total_height = sum(line_heights[i] + (padding_y * 2) for i in range(len(line_heights)))
-                        except:
-                            max_width = max(len(line) * 10 for line in text_lines)
-                            total_height = len(text_lines) * 30
-                        
-                        box_width = max_width + (padding_x * 2)
-                        box_height = total_height
-                        
-                        # Update bounding box
-                        min_x = min(min_x, x)
-                        min_y = min(min_y, y)
-                        max_x = max(max_x, x + box_width)
-                        max_y = max(max_y, y + box_height)
+                        boxes.append((x, y, x + measurement["box_width"], y + measurement["box_height"]))
                         
                         # Also include leader lines
                         if label.has_leader and label.leader_points:
-                            for point in label.leader_points:
-                                min_x = min(min_x, point[0])
-                                min_y = min(min_y, point[1])
-                                max_x = max(max_x, point[0])
-                                max_y = max(max_y, point[1])
+                            pts.extend(label.leader_points)
+                
+                # Expand bounding box to include all labels
+                if len(boxes) + len(pts) > NUMPY_BBOX_THRESHOLD:
+                    # Large exports: a handful of C-level reductions
+                    if boxes:
+                        boxes = np.asarray(boxes, dtype=np.float64)
+                        min_x = min(min_x, float(boxes[:, 0].min()))
+                        min_y = min(min_y, float(boxes[:, 1].min()))
+                        max_x = max(max_x, float(boxes[:, 2].max()))
+                        max_y = max(max_y, float(boxes[:, 3].max()))
+                    if pts:
+                        pts = np.asarray(pts, dtype=np.float64)
+                        min_x = min(min_x, float(pts[:, 0].min()))
+                        min_y = min(min_y, float(pts[:, 1].min()))
+                        max_x = max(max_x, float(pts[:, 0].max()))
+                        max_y = max(max_y, float(pts[:, 1].max()))
+                else:
+                    # Small exports: array setup costs more than inline comparisons
+                    for x1, y1, x2, y2 in boxes:
+                        min_x = x1 if x1 < min_x else min_x
+                        min_y = y1 if y1 < min_y else min_y
+                        max_x = x2 if x2 > max_x else max_x
+                        max_y = y2 if y2 > max_y else max_y
+                    for point in pts:
+                        px, py = point[0], point[1]
+                        min_x = px if px < min_x else min_x
+                        min_y = py if py < min_y else min_y
+                        max_x = px if px > max_x else max_x
+                        max_y = py if py > max_y else max_y
                 
                 # Add some padding around the entire composition
                 padding = 20
@@ -2715,7 +3102,9 @@ class LayoutTextLabeler:
                     export_image = self.draw_shapes_on_export(export_image, offset=(pdf_offset_x, pdf_offset_y))
                 
                 # Draw labels (with offset)
-                export_image = self.draw_labels_on_export(export_image, offset=(pdf_offset_x, pdf_offset_y))
+                if active_labels:
+                    export_image = self.draw_labels_on_export(export_image, offset=(pdf_offset_x, pdf_offset_y),
+                                                              measurements=measurements, labels=active_labels)
                 
                 export_image.save(file_path)
                 messagebox.showinfo("Success", f"Image exported successfully\n\nCanvas size: {canvas_width}x{canvas_height}px")
@@ -2726,6 +3115,38 @@ class LayoutTextLabeler:
                 import traceback
                 traceback.print_exc()
     
+    def _get_font(self, size: int, font_name: str = "arial.ttf") -> ImageFont.ImageFont:
+        """Load a TrueType font for export, memoized by (font_name, size)"""
+        key = (font_name, size)
+        font = self._font_cache.get(key)
+        if font is not None:
+            return font
+        
+        if font_name not in self._font_paths:
+            # Styled fonts fall back to the regular font if they can't be found
+            self._font_paths[font_name] = _probe_font([font_name, f"C:/Windows/Fonts/{font_name}"]) or self._font_path
+        path = self._font_paths[font_name]
+        
+        font = None
+        if path:
+            try:
+                font = ImageFont.truetype(path, size)
+            except (OSError, ValueError):
+                pass  # Unreadable font file or invalid size: use PIL's default font
+        if font is None:
+            font = ImageFont.load_default()
+        self._font_cache[key] = font
+        return font
+    
+    def _get_line_height(self, font: ImageFont.ImageFont) -> int:
+        """Return the line height (ascent + descent) of an export font, memoized per font"""
+        height = self._line_height_cache.get(font)
+        if height is None:
+            ascent, descent = font.getmetrics()
+            height = ascent + descent
+            self._line_height_cache[font] = height
+        return height
+    
     def draw_shapes_on_export(self, image: Image.Image, offset=(0, 0)) -> Image.Image:
         """Draw shapes on export image with optional offset"""
         overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
@@ -2738,17 +3159,20 @@ class LayoutTextLabeler:
             color_hex = shape.get("color", "#FF0000")
             shape_type = shape.get("type", "rectangle")
             
-            color_rgb = tuple(int(color_hex.lstrip('#')[i:i+2], 16) for i in (0, 2, 4))
+            color_rgb = _hex_to_rgb(color_hex)
             color_rgba = color_rgb + (80,)
             
-            # Apply offset to coordinates
-            offset_coords = [coords[i] + (offset_x if i % 2 == 0 else offset_y) for i in range(len(coords))]
+            # Apply offset to coordinates (x at even indices, y at odd)
+            c = np.asarray(coords, dtype=np.float64)
+            c[0::2] += offset_x
+            c[1::2] += offset_y
+            offset_coords = c.tolist()
             
             if shape_type == "rectangle":
                 draw.rectangle(offset_coords, fill=color_rgba, outline=color_rgb + (150,), width=2)
             elif shape_type == "polygon":
-                points = [(offset_coords[i], offset_coords[i+1]) for i in range(0, len(offset_coords), 2)]
-                draw.polygon(points, fill=color_rgba, outline=color_rgb + (150,), width=2)
+                # Pillow accepts a flat [x1, y1, x2, y2, ...] sequence directly
+                draw.polygon(offset_coords, fill=color_rgba, outline=color_rgb + (150,), width=2)
             elif shape_type == "oval":
                 # Oval coordinates: [x1, y1, x2, y2] (bounding box)
                 draw.ellipse(offset_coords, fill=color_rgba, outline=color_rgb + (150,), width=2)
@@ -2765,155 +3189,178 @@ class LayoutTextLabeler:
         image = Image.alpha_composite(image, overlay)
         return image
     
-    def draw_labels_on_export(self, image: Image.Image, offset=(0, 0)) -> Image.Image:
-        """Draw labels and leader lines on export image with per-line formatting"""
+    def _measure_label_for_export(self, label: TextLabel, draw: ImageDraw.ImageDraw) -> Optional[Dict]:
+        """Load fonts and measure the non-empty lines of a label for export
+        
+        Returns None when the label has no visible text, otherwise a dict with the
+        per-line fonts, display texts, widths and heights plus the overall box size.
+        """
+        text_lines = [line for line in label.text_lines if line.strip()]
+        if not text_lines:
+            return None
+        
+        # Must match the padding used in draw_labels_on_export
+        padding_x = 15
+        padding_y = 8
+        line_heights = []
+        line_widths = []
+        fonts = []
+        
+        # Store display texts with units for later use
+        display_texts = []
+        
+        # Local aliases for the per-line lists (avoids attribute lookups inside the loop)
+        lfs = label.line_font_sizes
+        lvars = label.line_variables
+        lis = label.line_is_sales
+        lum = label.line_unit_metric
+        
+        for i, text in enumerate(text_lines):
+            # Get per-line font size
+            if i < len(lfs):
+                font_size = lfs[i]
+            else:
+                font_size = 12
+            
+            # Check if this line has a variable with text style properties
+            is_bold = False
+            is_italic = False
+            
+            if i < len(lvars):
+                var_name = lvars[i]
+                if var_name and var_name != "None":
+                    # Find the variable
+                    for v in self.variables:
+                        if v.name == var_name:
+                            is_bold = getattr(v, 'text_bold', False)
+                            is_italic = getattr(v, 'text_italic', False)
+                            break
+            
+            # Load appropriate font based on style
+            font_name = "arial.ttf"
+            if is_bold and is_italic:
+                font_name = "arialbi.ttf"  # Bold + Italic
+            elif is_bold:
+                font_name = "arialbd.ttf"  # Bold
+            elif is_italic:
+                font_name = "ariali.ttf"   # Italic
+            
+            # Load font (cached per style and size)
+            custom_font = self._get_font(font_size, font_name)
+            
+            fonts.append(custom_font)
+            
+            # Prepare display text - add unit if Sales/Area is checked
+            # (Sales/Area checked and a unit metric set -> append the unit symbol)
+            is_sales = i < len(lis) and lis[i]
+            unit_str = lum[i] if i < len(lum) else "None"
+            display_text = f"{text} {_unit_symbol(unit_str)}" if is_sales and unit_str != "None" else text
+            
+            # Store the display text for later use
+            display_texts.append(display_text)
+            
+            # Measure text (using display_text which includes unit if applicable)
+            try:
+                # textlength skips the vertical metric lookup; height comes from font metrics
+                text_width = draw.textlength(display_text, font=custom_font)
+                # Add 10% safety margin to prevent cutoff
+                line_widths.append(int(text_width * 1.1))
+                line_heights.append(self._get_line_height(custom_font))
+            except:
+                line_widths.append(len(display_text) * (font_size * 0.6))
+                line_heights.append(font_size + 4)
+        
+        max_width = max(line_widths) if line_widths else 0
+        
+        return {
+            "text_lines": text_lines,
+            "fonts": fonts,
+            "display_texts": display_texts,
+            "line_widths": line_widths,
+            "line_heights": line_heights,
+            "max_width": max_width,
+            # Boxes are stacked with no gaps
+            "box_width": max_width + (padding_x * 2),
+            "box_height": sum(h + (padding_y * 2) for h in line_heights),
+        }
+    
+    def draw_labels_on_export(self, image: Image.Image, offset=(0, 0), measurements=None,
+                              labels: Optional[List[TextLabel]] = None) -> Image.Image:
+        """Draw labels and leader lines on export image with per-line formatting
+        
+        labels: labels to draw (defaults to self.labels)
+        measurements: optional list (parallel to labels) from _measure_label_for_export,
+        so text measured while sizing the export canvas isn't measured twice
+        """
+        if labels is None:
+            labels = self.labels
+        
         draw = ImageDraw.Draw(image)
         
         offset_x, offset_y = offset
         
-        for label in self.labels:
-            # Draw leader line if needed (with offset)
-            if label.has_leader and label.leader_points:
-                line_coords = []
-                for point in label.leader_points:
-                    line_coords.append((point[0] + offset_x, point[1] + offset_y))
+        # Collect leader polylines and arrowheads in one pass, then draw them together
+        leader_segments = []
+        arrow_polys = []
+        for label in labels:
+            if label.has_leader and label.leader_points and len(label.leader_points) >= 2:
+                line_coords = [(point[0] + offset_x, point[1] + offset_y) for point in label.leader_points]
+                leader_segments.append(line_coords)
+                
+                # Arrowhead direction from the last segment
+                end_point = line_coords[-1]
+                start_point = line_coords[-2]
+                dx = end_point[0] - start_point[0]
+                dy = end_point[1] - start_point[1]
+                length = math.hypot(dx, dy)
                 
-                if len(line_coords) >= 2:
-                    draw.line(line_coords, fill="#666666", width=3)
+                if length > 0:
+                    dx /= length
+                    dy /= length
                     
-                    # Draw arrowhead
-                    end_point = line_coords[-1]
-                    start_point = line_coords[-2] if len(line_coords) > 1 else line_coords[0]
+                    # Calculate arrow points (trig constants precomputed at module level)
+                    left_x = end_point[0] - _ARROW_SIZE * (dx * _ARROW_COS + dy * _ARROW_SIN)
+                    left_y = end_point[1] - _ARROW_SIZE * (dy * _ARROW_COS - dx * _ARROW_SIN)
                     
-                    # Calculate arrow direction
-                    dx = end_point[0] - start_point[0]
-                    dy = end_point[1] - start_point[1]
-                    length = math.sqrt(dx*dx + dy*dy)
+                    right_x = end_point[0] - _ARROW_SIZE * (dx * _ARROW_COS - dy * _ARROW_SIN)
+                    right_y = end_point[1] - _ARROW_SIZE * (dy * _ARROW_COS + dx * _ARROW_SIN)
                     
-                    if length > 0:
-                        dx /= length
-                        dy /= length
-                        
-                        # Arrow head size
-                        arrow_size = 10
-                        arrow_angle = math.pi / 6
-                        
-                        # Calculate arrow points
-                        left_x = end_point[0] - arrow_size * (dx * math.cos(arrow_angle) + dy * math.sin(arrow_angle))
-                        left_y = end_point[1] - arrow_size * (dy * math.cos(arrow_angle) - dx * math.sin(arrow_angle))
-                        
-                        right_x = end_point[0] - arrow_size * (dx * math.cos(arrow_angle) - dy * math.sin(arrow_angle))
-                        right_y = end_point[1] - arrow_size * (dy * math.cos(arrow_angle) + dx * math.sin(arrow_angle))
-                        
-                        draw.polygon([end_point, (left_x, left_y), (right_x, right_y)], fill="#666666")
-            
+                    arrow_polys.append([end_point, (left_x, left_y), (right_x, right_y)])
+        
+        # Leaders go underneath every label box
+        for line_coords in leader_segments:
+            draw.line(line_coords, fill="#666666", width=3)
+        for arrow in arrow_polys:
+            draw.polygon(arrow, fill="#666666")
+        
+        for label_idx, label in enumerate(labels):
             # Draw text background with per-line formatting (with offset)
-            text_lines = [line for line in label.text_lines if line.strip()]
-            if text_lines:
+            if measurements is not None:
+                measurement = measurements[label_idx]
+            else:
+                measurement = self._measure_label_for_export(label, draw)
+            
+            if measurement:
                 x, y = label.position[0] + offset_x, label.position[1] + offset_y
+                text_lines = measurement["text_lines"]
+                fonts = measurement["fonts"]
+                display_texts = measurement["display_texts"]
+                line_widths = measurement["line_widths"]
+                line_heights = measurement["line_heights"]
+                max_width = measurement["max_width"]
                 
-                # Calculate dimensions for each line with its own font size
-                padding_x = 10
-                padding_y = 8
-                line_heights = []
-                line_widths = []
-                fonts = []
-                
-                # Store display texts with units for later use
-                display_texts = []
-                
-                for i, text in enumerate(text_lines):
-                    # Get per-line font size
-                    if i < len(label.line_font_sizes):
-                        font_size = label.line_font_sizes[i]
-                    else:
-                        font_size = 12
-                    
-                    # Check if this line has a variable with text style properties
-                    is_bold = False
-                    is_italic = False
-                    
-                    if i < len(label.line_variables):
-                        var_name = label.line_variables[i]
-                        if var_name and var_name != "None":
-                            # Find the variable
-                            for v in self.variables:
-                                if v.name == var_name:
-                                    is_bold = getattr(v, 'text_bold', False)
-                                    is_italic = getattr(v, 'text_italic', False)
-                                    break
-                    
-                    # Load appropriate font based on style
-                    font_name = "arial.ttf"
-                    if is_bold and is_italic:
-                        font_name = "arialbi.ttf"  # Bold + Italic
-                    elif is_bold:
-                        font_name = "arialbd.ttf"  # Bold
-                    elif is_italic:
-                        font_name = "ariali.ttf"   # Italic
-                    
-                    # Load font
-                    try:
-                        custom_font = ImageFont.truetype(font_name, font_size)
-                    except:
-                        try:
-                            custom_font = ImageFont.truetype(f"C:/Windows/Fonts/{font_name}", font_size)
-                        except:
-                            # Fallback to regular arial if styled font not found
-                            try:
-                                custom_font = ImageFont.truetype("arial.ttf", font_size)
-                            except:
-                                try:
-                                    custom_font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", font_size)
-                                except:
-                                    custom_font = ImageFont.load_default()
-                    
-                    fonts.append(custom_font)
-                    
-                    # Prepare display text - add unit if Sales/Area is checked
-                    display_text = text
-                    if i < len(label.line_is_sales) and label.line_is_sales[i]:
-                        # Sales/Area is checked, append unit metric
-                        if i < len(label.line_unit_metric) and label.line_unit_metric[i] != "None":
-                            unit_str = label.line_unit_metric[i]
-                            # Extract just the unit symbol (e.g., "m²" from "m² (Square Meter)")
-                            if "(" in unit_str:
-                                unit_symbol = unit_str.split("(")[0].strip()
-                            else:
-                                unit_symbol = unit_str
-                            display_text = f"{text} {unit_symbol}"
-                    
-                    # Store the display text for later use
-                    display_texts.append(display_text)
-                    
-                    # Measure text (using display_text which includes unit if applicable)
-                    try:
-                        bbox = draw.textbbox((0, 0), display_text, font=custom_font)
-                        text_width = bbox[2] - bbox[0]
-                        # Add 10% safety margin to prevent cutoff
-                        line_widths.append(int(text_width * 1.1))
-                        line_heights.append(bbox[3] - bbox[1])
-                    except:
-                        line_widths.append(len(display_text) * (font_size * 0.6))
-                        line_heights.append(font_size + 4)
-
-                
-                # Calculate box dimensions
-                max_width = max(line_widths) if line_widths else 0
-                # Auto-scale spacing based on text size (20% of average font size)
-                avg_font_size = sum(label.line_font_sizes[:len(text_lines)]) / len(text_lines) if text_lines else 12
-                line_spacing_per_line = int(avg_font_size * 0.2)  # 20% of font size
-                line_spacing = line_spacing_per_line * (len(line_heights) - 1) if len(line_heights) > 1 else 0
-                total_height = sum(line_heights) + line_spacing if line_heights else 0
-                box_width = max_width + (padding_x * 2)
-                box_height = total_height + (padding_y * 2)
+                # Local aliases for the per-line lists (avoids attribute lookups inside the loop)
+                lfs = label.line_font_sizes
+                lbc = label.line_bg_colors
+                lfc = label.line_font_colors
+                lvars = label.line_variables
                 
                 # Draw per-line background boxes and text
                 current_y = y
                 for i, text in enumerate(text_lines):
                     # Get per-line background color
-                    if i < len(label.line_bg_colors):
-                        bg_color = label.line_bg_colors[i]
+                    if i < len(lbc):
+                        bg_color = lbc[i]
                     else:
                         bg_color = "#FFFFFF"
                     
@@ -2935,8 +3382,8 @@ class LayoutTextLabeler:
                     )
                     
                     # Get per-line text color
-                    if i < len(label.line_font_colors):
-                        text_color = label.line_font_colors[i]
+                    if i < len(lfc):
+                        text_color = lfc[i]
                     else:
                         text_color = "#000000"
                     
@@ -2949,8 +3396,8 @@ class LayoutTextLabeler:
                     draw.text((text_x, text_y), display_text, fill=text_color, font=fonts[i], anchor="mt")
                     
                     # Check if underline is needed
-                    if i < len(label.line_variables):
-                        var_name = label.line_variables[i]
+                    if i < len(lvars):
+                        var_name = lvars[i]
                         if var_name and var_name != "None":
                             for v in self.variables:
                                 if v.name == var_name:
@@ -2960,13 +3407,12 @@ class LayoutTextLabeler:
                                         draw.line(
                                             [(text_x, underline_y), (text_x + line_widths[i], underline_y)],
                                             fill=text_color,
-                                            width=max(1, int(label.line_font_sizes[i] / 12))
+                                            width=max(1, int(lfs[i] / 12))
                                         )
                                     break
                     
                     # Move to next line (boxes touch each other - matching preview)
                     current_y += line_box_height
-
         
         return image
     
@@ -2996,7 +3442,7 @@ class LayoutTextLabeler:
         operator_combo = ttk.Combobox(
             rule_frame,
             textvariable=operator_var,
-            values=[">", ">=", "<", "<=", "==", "!="],
+            values=self.RULE_OPERATORS,
             state="readonly",
             width=4
         )
@@ -3052,7 +3498,7 @@ class LayoutTextLabeler:
         """Open color picker for a rule"""
         color = colorchooser.askcolor(title="Choose Rule Color", initialcolor=rule.color)
         if color[1]:
-            rule.color = color[1]
+            rule.color = _intern(color[1])
             color_btn.config(bg=color[1])
     
     def remove_color_rule(self, index: int, rule_frame):
@@ -3075,20 +3521,7 @@ class LayoutTextLabeler:
     
     def extract_number_from_text(self, text: str) -> Optional[float]:
         """Extract a number from text string"""
-        if not text:
-            return None
-        
-        # Remove common currency symbols and commas
-        cleaned = text.replace('$', '').replace(',', '').replace('฿', '').replace('€', '').replace('£', '')
-        
-        # Try to find a number (including decimals)
-        match = re.search(r'-?\d+\.?\d*', cleaned)
-        if match:
-            try:
-                return float(match.group())
-            except ValueError:
-                return None
-        return None
+        return _extract_number(text)
     
     def evaluate_rules_for_value(self, value: float) -> Optional[str]:
         """Evaluate all rules and return the color for the first matching rule"""
@@ -3189,10 +3622,17 @@ class LayoutTextLabeler:
         
         # Populate listbox
         def refresh_list():
-            var_listbox.delete(0, tk.END)
-            for var in self.variables:
-                rule_count = len(var.rules)
-                var_listbox.insert(tk.END, f"{var.name} ({rule_count} rules)")
+            # Only touch rows whose text changed instead of clearing the whole listbox
+            entries = [f"{var.name} ({len(var.rules)} rules)" for var in self.variables]
+            current = var_listbox.get(0, tk.END)
+            if len(current) > len(entries):
+                var_listbox.delete(len(entries), tk.END)
+            for i, entry in enumerate(entries):
+                if i >= len(current):
+                    var_listbox.insert(tk.END, entry)
+                elif current[i] != entry:
+                    var_listbox.delete(i)
+                    var_listbox.insert(i, entry)
         
         refresh_list()
         
@@ -3315,9 +3755,7 @@ class LayoutTextLabeler:
         unit_frame.pack(fill=tk.X, pady=2)
         ttk.Label(unit_frame, text="Default Unit:", width=12).pack(side=tk.LEFT)
         default_unit_var = tk.StringVar(value="None")
-        unit_options = ["None", "m² (Square Meter)", "m³ (Cubic Meter)", "ft² (Square Feet)", 
-                       "ft³ (Cubic Feet)", "ha (Hectare)", "acre"]
-        ttk.Combobox(unit_frame, textvariable=default_unit_var, values=unit_options, 
+        ttk.Combobox(unit_frame, textvariable=default_unit_var, values=self.UNIT_OPTIONS, 
                     state="readonly", width=20).pack(side=tk.LEFT, padx=5)
         ttk.Label(unit_frame, text="(used when auto-enabled)", font=("Arial", 8), 
                  foreground="gray").pack(side=tk.LEFT)
@@ -3331,12 +3769,19 @@ class LayoutTextLabeler:
         
         temp_rules = []
         
+        def make_rule_remover(entry):
+            """× button: drop the rule from temp_rules and destroy its row"""
+            def remove():
+                temp_rules.remove(entry)
+                entry[3].destroy()
+            return remove
+        
         def add_rule():
             rule_frame = ttk.Frame(rules_container, relief=tk.GROOVE, borderwidth=1)
             rule_frame.pack(fill=tk.X, pady=2)
             
             operator_var = tk.StringVar(value=">")
-            ttk.Combobox(rule_frame, textvariable=operator_var, values=[">", ">=", "<", "<=", "==", "!="], state="readonly", width=4).pack(side=tk.LEFT, padx=2)
+            ttk.Combobox(rule_frame, textvariable=operator_var, values=self.RULE_OPERATORS, state="readonly", width=4).pack(side=tk.LEFT, padx=2)
             
             threshold_var = tk.DoubleVar(value=0)
             ttk.Entry(rule_frame, textvariable=threshold_var, width=10).pack(side=tk.LEFT, padx=2)
@@ -3346,9 +3791,9 @@ class LayoutTextLabeler:
                                  command=lambda: self.pick_color_for_rule(color_var, color_btn))
             color_btn.pack(side=tk.LEFT, padx=2)
             
-            ttk.Button(rule_frame, text="×", width=3, command=rule_frame.destroy).pack(side=tk.LEFT, padx=2)
-            
-            temp_rules.append((operator_var, threshold_var, color_var, rule_frame))
+            entry = (operator_var, threshold_var, color_var, rule_frame)
+            temp_rules.append(entry)
+            ttk.Button(rule_frame, text="×", width=3, command=make_rule_remover(entry)).pack(side=tk.LEFT, padx=2)
         
         ttk.Button(rules_frame, text="+ Add Rule", command=add_rule).pack(pady=5)
         
@@ -3481,9 +3926,7 @@ class LayoutTextLabeler:
         unit_frame.pack(fill=tk.X, pady=2)
         ttk.Label(unit_frame, text="Default Unit:", width=12).pack(side=tk.LEFT)
         default_unit_var = tk.StringVar(value=variable.default_unit)
-        unit_options = ["None", "m² (Square Meter)", "m³ (Cubic Meter)", "ft² (Square Feet)", 
-                       "ft³ (Cubic Feet)", "ha (Hectare)", "acre"]
-        ttk.Combobox(unit_frame, textvariable=default_unit_var, values=unit_options, 
+        ttk.Combobox(unit_frame, textvariable=default_unit_var, values=self.UNIT_OPTIONS, 
                     state="readonly", width=20).pack(side=tk.LEFT, padx=5)
         ttk.Label(unit_frame, text="(used when auto-enabled)", font=("Arial", 8), 
                  foreground="gray").pack(side=tk.LEFT)
@@ -3498,13 +3941,20 @@ class LayoutTextLabeler:
         
         temp_rules = []
         
+        def make_rule_remover(entry):
+            """× button: drop the rule from temp_rules and destroy its row"""
+            def remove():
+                temp_rules.remove(entry)
+                entry[3].destroy()
+            return remove
+        
         # Load existing rules
         for rule in variable.rules:
             rule_frame = ttk.Frame(rules_container, relief=tk.GROOVE, borderwidth=1)
             rule_frame.pack(fill=tk.X, pady=2)
             
             operator_var = tk.StringVar(value=rule.operator)
-            ttk.Combobox(rule_frame, textvariable=operator_var, values=[">", ">=", "<", "<=", "==", "!="], state="readonly", width=4).pack(side=tk.LEFT, padx=2)
+            ttk.Combobox(rule_frame, textvariable=operator_var, values=self.RULE_OPERATORS, state="readonly", width=4).pack(side=tk.LEFT, padx=2)
             
             threshold_var = tk.DoubleVar(value=rule.threshold)
             ttk.Entry(rule_frame, textvariable=threshold_var, width=10).pack(side=tk.LEFT, padx=2)
@@ -3519,16 +3969,16 @@ class LayoutTextLabeler:
             color_btn.config(command=make_color_picker(color_var, color_btn))
             color_btn.pack(side=tk.LEFT, padx=2)
             
-            ttk.Button(rule_frame, text="×", width=3, command=rule_frame.destroy).pack(side=tk.LEFT, padx=2)
-            
-            temp_rules.append((operator_var, threshold_var, color_var, rule_frame))
+            entry = (operator_var, threshold_var, color_var, rule_frame)
+            temp_rules.append(entry)
+            ttk.Button(rule_frame, text="×", width=3, command=make_rule_remover(entry)).pack(side=tk.LEFT, padx=2)
         
         def add_rule():
             rule_frame = ttk.Frame(rules_container, relief=tk.GROOVE, borderwidth=1)
             rule_frame.pack(fill=tk.X, pady=2)
             
             operator_var = tk.StringVar(value=">")
-            ttk.Combobox(rule_frame, textvariable=operator_var, values=[">", ">=", "<", "<=", "==", "!="], state="readonly", width=4).pack(side=tk.LEFT, padx=2)
+            ttk.Combobox(rule_frame, textvariable=operator_var, values=self.RULE_OPERATORS, state="readonly", width=4).pack(side=tk.LEFT, padx=2)
             
             threshold_var = tk.DoubleVar(value=0)
             ttk.Entry(rule_frame, textvariable=threshold_var, width=10).pack(side=tk.LEFT, padx=2)
@@ -3538,9 +3988,9 @@ class LayoutTextLabeler:
                                  command=lambda: self.pick_color_for_rule(color_var, color_btn))
             color_btn.pack(side=tk.LEFT, padx=2)
             
-            ttk.Button(rule_frame, text="×", width=3, command=rule_frame.destroy).pack(side=tk.LEFT, padx=2)
-            
-            temp_rules.append((operator_var, threshold_var, color_var, rule_frame))
+            entry = (operator_var, threshold_var, color_var, rule_frame)
+            temp_rules.append(entry)
+            ttk.Button(rule_frame, text="×", width=3, command=make_rule_remover(entry)).pack(side=tk.LEFT, padx=2)
         
         ttk.Button(rules_frame, text="+ Add Rule", command=add_rule).pack(pady=5)
         
@@ -3571,12 +4021,12 @@ class LayoutTextLabeler:
                             label.line_variables[i] = new_name
             
             variable.rules.clear()
-            for operator_var, threshold_var, color_var, frame in temp_rules:
-                if frame.winfo_exists():
-                    try:
-                        variable.add_rule(operator_var.get(), threshold_var.get(), color_var.get())
-                    except:
-                        pass
+            # temp_rules only holds live rows (× removes its entry)
+            for operator_var, threshold_var, color_var, _ in temp_rules:
+                try:
+                    variable.add_rule(operator_var.get(), threshold_var.get(), color_var.get())
+                except:
+                    pass
             
             # Save text formatting properties
             variable.text_color = text_color_var.get() if text_color_var.get() else None
@@ -3619,8 +4069,30 @@ class LayoutTextLabeler:
             else:
                 self.variables_summary_var.set(f"{len(var_names)} variables defined")
     
+    def _variable_to_dict(self, var: Variable) -> Dict:
+        """Serialize a variable and its rules for the conditions file"""
+        return {
+            "name": var.name,
+            "text_color": var.text_color,
+            "bg_color": var.bg_color,
+            "text_size": var.text_size,
+            "text_bold": getattr(var, 'text_bold', False),
+            "text_italic": getattr(var, 'text_italic', False),
+            "text_underline": getattr(var, 'text_underline', False),
+            "auto_enable_sales": var.auto_enable_sales,
+            "default_unit": var.default_unit,
+            "rules": [
+                {
+                    "operator": rule.operator,
+                    "threshold": rule.threshold,
+                    "color": rule.color
+                }
+                for rule in var.rules
+            ]
+        }
+    
     def export_conditions(self):
-        """Export all variables and their rules to a JSON file"""
+        """Export all variables and their rules to a compact JSON file"""
         if not self.variables:
             messagebox.showinfo("Info", "No variables to export")
             return
@@ -3636,39 +4108,14 @@ class LayoutTextLabeler:
             return
         
         try:
-            # Build export data
-            export_data = {
-                "variables": []
-            }
-            
-            for var in self.variables:
-                var_dict = {
-                    "name": var.name,
-                    "text_color": var.text_color,
-                    "bg_color": var.bg_color,
-                    "text_size": var.text_size,
-                    "text_bold": getattr(var, 'text_bold', False),
-                    "text_italic": getattr(var, 'text_italic', False),
-                    "text_underline": getattr(var, 'text_underline', False),
-                    "auto_enable_sales": var.auto_enable_sales,
-                    "default_unit": var.default_unit,
-                    "rules": []
-                }
-                
-                for rule in var.rules:
-                    rule_dict = {
-                        "operator": rule.operator,
-                        "threshold": rule.threshold,
-                        "color": rule.color
-                    }
-                    var_dict["rules"].append(rule_dict)
-                
-                export_data["variables"].append(var_dict)
-
-            
-            # Write to file
+            # Stream one variable at a time instead of building the whole export dict
             with open(file_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
+                f.write('{"variables":[')
+                for i, var in enumerate(self.variables):
+                    if i:
+                        f.write(',')
+                    f.write(json.dumps(self._variable_to_dict(var), separators=(',', ':')))
+                f.write(']}')
             
             messagebox.showinfo("Success", f"Exported {len(self.variables)} variable(s) to:\n{os.path.basename(file_path)}")
             self.status_var.set(f"Conditions exported to {os.path.basename(file_path)}")
@@ -3688,9 +4135,8 @@ class LayoutTextLabeler:
             return
         
         try:
-            # Read from file
-            with open(file_path, 'r') as f:
-                import_data = json.load(f)
+            # Read from file (orjson over the raw bytes when available)
+            import_data = _read_json_file(file_path)
             
             if "variables" not in import_data:
                 messagebox.showerror("Error", "Invalid conditions file format")
@@ -3713,13 +4159,10 @@ class LayoutTextLabeler:
             
             # Import variables
             imported_count = 0
+            by_name = {v.name: v for v in self.variables}
             for var_dict in import_data["variables"]:
                 # Check if variable with same name exists
-                existing_var = None
-                for v in self.variables:
-                    if v.name == var_dict["name"]:
-                        existing_var = v
-                        break
+                existing_var = by_name.get(var_dict["name"])
                 
                 if existing_var:
                     # Update existing variable
@@ -3745,6 +4188,7 @@ class LayoutTextLabeler:
                     var.auto_enable_sales = var_dict.get("auto_enable_sales", False)
                     var.default_unit = var_dict.get("default_unit", "None")
                     self.variables.append(var)
+                    by_name[var.name] = var
 
                 
                 # Import rules
@@ -3761,8 +4205,8 @@ class LayoutTextLabeler:
             self.update_variables_summary()
             
             # Update variable dropdowns in text entries
+            variable_names = ["None", *(v.name for v in self.variables)]
             for line_frame in self.text_entry_widgets:
-                variable_names = ["None"] + [v.name for v in self.variables]
                 line_frame.variable_combo.config(values=variable_names)
             
             messagebox.showinfo("Success", f"Imported {imported_count} variable(s) from:\n{os.path.basename(file_path)}")
@@ -3794,44 +4238,78 @@ class LayoutTextLabeler:
         colored_count = 0
         formatted_count = 0
         
+        # Variable lookup by name (reversed so the first of any duplicate names wins)
+        var_by_name = {v.name: v for v in reversed(self.variables)}
+        extract_number = _extract_number  # Memoized module-level parser, bound once
+        
+        # Shape color candidates in label/line order: (shape index, variable, line text).
+        # Rules are evaluated per variable in one vectorized pass afterwards.
+        color_candidates = []
+        candidates_by_var = {}  # id(variable) -> positions in color_candidates
+        
         # Process each label
         for label in self.labels:
-            # Check each line for variable assignments
-            for line_idx, var_name in enumerate(label.line_variables):
-                if var_name != "None" and line_idx < len(label.text_lines):
+            # Lines with a variable assigned; labels without any are skipped outright.
+            # (Derived here rather than cached on the label, since line_variables is
+            # edited in place all over the UI.)
+            assigned_lines = [(line_idx, var_name) for line_idx, var_name in enumerate(label.line_variables)
+                              if var_name != "None"]
+            if not assigned_lines:
+                continue
+            
+            num_text_lines = len(label.text_lines)
+            num_font_colors = len(label.line_font_colors)
+            num_bg_colors = len(label.line_bg_colors)
+            num_font_sizes = len(label.line_font_sizes)
+            
+            # Check each assigned line
+            for line_idx, var_name in assigned_lines:
+                if line_idx < num_text_lines:
                     # Find the variable
-                    variable = next((v for v in self.variables if v.name == var_name), None)
+                    variable = var_by_name.get(var_name)
                     
                     if variable:
-                        # Extract value from text
-                        value = self.extract_number_from_text(label.text_lines[line_idx])
-                        
-                        if value is not None:
-                            # Evaluate variable's rules for shape color
-                            color = variable.evaluate(value)
-                            
-                            if color and label.shape_index < len(self.shapes):
-                                self.shapes[label.shape_index]["color"] = color
-                                colored_count += 1
+                        # Queue the value for shape color evaluation
+                        candidates_by_var.setdefault(id(variable), []).append(len(color_candidates))
+                        color_candidates.append((label.shape_index, variable, label.text_lines[line_idx]))
                         
                         # Apply text formatting from variable (regardless of value)
                         if variable.text_color:
-                            if line_idx < len(label.line_font_colors):
+                            if line_idx < num_font_colors:
                                 label.line_font_colors[line_idx] = variable.text_color
                                 formatted_count += 1
                         
                         if variable.bg_color:
-                            if line_idx < len(label.line_bg_colors):
+                            if line_idx < num_bg_colors:
                                 label.line_bg_colors[line_idx] = variable.bg_color
                                 formatted_count += 1
                         
                         if variable.text_size:
-                            if line_idx < len(label.line_font_sizes):
+                            if line_idx < num_font_sizes:
                                 label.line_font_sizes[line_idx] = variable.text_size
                                 formatted_count += 1
         
+        # Parse each distinct line text once for the whole batch (repeated cells such as
+        # "0" or "N/A" are common, and a run can exceed the parser's LRU size)
+        numbers = {text: extract_number(text) for text in {candidate[2] for candidate in color_candidates}}
+        
+        # Evaluate each variable's rules over all of its values at once (unparsable text -> NaN)
+        resolved_colors = [None] * len(color_candidates)
+        for positions in candidates_by_var.values():
+            variable = color_candidates[positions[0]][1]
+            values = np.array([numbers[color_candidates[pos][2]] for pos in positions], dtype=np.float64)
+            for pos, color in zip(positions, variable.evaluate_many(values)):
+                resolved_colors[pos] = color
+        
+        # Write colors back in label/line order, so later lines still win for a shared shape
+        num_shapes = len(self.shapes)
+        for (shape_index, _, _), color in zip(color_candidates, resolved_colors):
+            if color and shape_index < num_shapes:
+                self.shapes[shape_index]["color"] = color
+                colored_count += 1
+        
         # Redraw canvas
-        self.display_canvas()
+        self._schedule_redraw()
         
         result_msg = f"Applied colors to {colored_count} shapes"
         if formatted_count > 0:
@@ -4011,21 +4489,63 @@ class LayoutTextLabeler:
         preview_h_scroll.config(command=preview_canvas.xview)
         preview_v_scroll.config(command=preview_canvas.yview)
         
-        # Zoom state
-        preview_zoom = {"scale": 1.0, "base_scale": 1.0}
+        # Zoom state (cached: last resized preview image, reused while its size is unchanged)
+        preview_zoom = {"scale": 1.0, "base_scale": 1.0, "cached": {"size": None, "photo": None},
+                        "image_item": None}  # Canvas item id of the PDF image, moved/reconfigured on redraw
+        
+        # Persistent base-shape canvas items: shape index -> item id
+        preview_canvas.shape_ids = {}
+        
+        # Canvas size cached from <Configure> so redraws don't query Tk each time
+        preview_zoom["canvas_size"] = None
+        
+        def on_preview_configure(event):
+            preview_zoom["canvas_size"] = (event.width, event.height)
+            schedule_redraw()  # First map and every resize; no polling while the canvas is idle
+        
+        preview_canvas.bind("<Configure>", on_preview_configure)
+        
+        # Redraw/highlight requests are coalesced into at most one run per idle cycle
+        pending = {"redraw": False, "highlight": False, "highlight_idx": None}
+        
+        def schedule_redraw():
+            if not pending["redraw"]:
+                pending["redraw"] = True
+                preview_canvas.after_idle(flush_redraw)
+        
+        def flush_redraw():
+            pending["redraw"] = False
+            draw_preview()
+        
+        def schedule_highlight(shape_idx):
+            pending["highlight_idx"] = shape_idx
+            if not pending["highlight"]:
+                pending["highlight"] = True
+                preview_canvas.after_idle(flush_highlight)
+        
+        def flush_highlight():
+            pending["highlight"] = False
+            highlight_shape(pending["highlight_idx"])
         
         # Draw PDF and shapes on preview canvas
         def draw_preview():
-            preview_canvas.delete("all")
-            
             # Get canvas size
-            canvas_width = preview_canvas.winfo_width()
-            canvas_height = preview_canvas.winfo_height()
+            if preview_zoom["canvas_size"] is None:
+                preview_zoom["canvas_size"] = (preview_canvas.winfo_width(), preview_canvas.winfo_height())
+            canvas_width, canvas_height = preview_zoom["canvas_size"]
             
             if canvas_width <= 1 or canvas_height <= 1:
-                # Canvas not ready yet, try again
-                preview_canvas.after(100, draw_preview)
+                # Canvas not mapped yet; its first <Configure> schedules the draw
+                preview_zoom["canvas_size"] = None
+                return
+            
+            # Base layer (PDF + shapes) only changes with zoom or canvas size
+            drawn_state = (preview_zoom["scale"], canvas_width, canvas_height)
+            if preview_zoom.get("drawn") == drawn_state:
                 return
+            preview_zoom["drawn"] = drawn_state
+            
+            preview_canvas.delete("highlight")
             
             # Draw PDF image if available
             if hasattr(self, 'pdf_image') and self.pdf_image:
@@ -4047,15 +4567,29 @@ class LayoutTextLabeler:
                 new_width = int(img_width * scale)
                 new_height = int(img_height * scale)
                 
-                from PIL import ImageTk
-                resized_img = self.pdf_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(resized_img)
+                cached = preview_zoom["cached"]
+                if cached["size"] == (new_width, new_height):
+                    photo = cached["photo"]
+                else:
+                    # Zoomed out below 100% the cheaper BILINEAR filter is indistinguishable here
+                    resample = Image.Resampling.BILINEAR if preview_zoom["scale"] < 1.0 else Image.Resampling.LANCZOS
+                    # reducing_gap lets PIL shrink with a cheap integer reduce before the filter pass
+                    resized_img = self.pdf_image.resize((new_width, new_height), resample, reducing_gap=2.0)
+                    photo = ImageTk.PhotoImage(resized_img)
+                    cached["size"] = (new_width, new_height)
+                    cached["photo"] = photo
                 
                 # Center image (or place at 0,0 for scrolling)
                 x_offset = max(0, (canvas_width - new_width) // 2)
                 y_offset = max(0, (canvas_height - new_height) // 2)
                 
-                preview_canvas.create_image(x_offset, y_offset, image=photo, anchor=tk.NW)
+                # Reuse the one image item instead of deleting and recreating it every redraw
+                if preview_zoom["image_item"] is None:
+                    preview_zoom["image_item"] = preview_canvas.create_image(x_offset, y_offset, image=photo, anchor=tk.NW)
+                    preview_canvas.tag_lower(preview_zoom["image_item"])
+                else:
+                    preview_canvas.coords(preview_zoom["image_item"], x_offset, y_offset)
+                    preview_canvas.itemconfigure(preview_zoom["image_item"], image=photo)
                 preview_canvas.image = photo  # Keep reference
                 
                 # Store scale and offset for shape drawing
@@ -4066,7 +4600,7 @@ class LayoutTextLabeler:
                 # Update scroll region
                 preview_canvas.config(scrollregion=(0, 0, new_width + x_offset * 2, new_height + y_offset * 2))
                 
-                # Draw all shapes
+                # Draw all shapes (existing items are moved in place)
                 for idx, shape in enumerate(shapes):
                     draw_shape_on_preview(shape, idx, scale, x_offset, y_offset, highlighted=False)
                 
@@ -4089,8 +4623,8 @@ class LayoutTextLabeler:
             # Limit zoom range
             preview_zoom["scale"] = max(0.5, min(5.0, preview_zoom["scale"]))
             
-            # Redraw with new zoom
-            draw_preview()
+            # Redraw with new zoom (once per idle cycle, however many wheel events arrive)
+            schedule_redraw()
         
         # Bind mouse wheel for zoom
         preview_canvas.bind("<MouseWheel>", on_preview_zoom)  # Windows
@@ -4111,6 +4645,24 @@ class LayoutTextLabeler:
         preview_canvas.bind("<ButtonPress-3>", on_pan_start)   # Right-click press
         preview_canvas.bind("<B3-Motion>", on_pan_move)        # Right-click drag
         
+        # Polygon coordinates as (N, 2) arrays, converted once per dialog
+        polygon_arrays = {}
+        
+        def place_base_shape(shape_idx, create_item, coords, color):
+            """Create a shape's base outline once, then only move/recolor it on later redraws"""
+            item_id = preview_canvas.shape_ids.get(shape_idx)
+            if item_id is None:
+                preview_canvas.shape_ids[shape_idx] = create_item(
+                    *coords,
+                    outline=color,
+                    fill="",  # Explicitly no fill
+                    width=2,
+                    tags=("base", f"shape_{shape_idx}")
+                )
+            else:
+                preview_canvas.coords(item_id, *coords)
+                preview_canvas.itemconfigure(item_id, outline=color)
+        
         def draw_shape_on_preview(shape, shape_idx, scale, x_offset, y_offset, highlighted=False):
             """Draw a single shape on the preview canvas"""
             shape_type = shape["type"]
@@ -4145,19 +4697,18 @@ class LayoutTextLabeler:
                     )
                 else:
                     # Draw normal shape (no fill)
-                    preview_canvas.create_rectangle(
-                        *scaled_coords,
-                        outline=shape.get("color", "#0000FF"),
-                        fill="",  # Explicitly no fill
-                        width=2,
-                        tags=f"shape_{shape_idx}"
+                    place_base_shape(
+                        shape_idx, preview_canvas.create_rectangle,
+                        scaled_coords,
+                        shape.get("color", "#0000FF")
                     )
                     
             elif shape_type == "polygon":
-                scaled_coords = []
-                for i in range(0, len(coords), 2):
-                    scaled_coords.append(coords[i] * scale + x_offset)
-                    scaled_coords.append(coords[i+1] * scale + y_offset)
+                # Scale all points in one NumPy pass: (x, y) * scale + (x_offset, y_offset)
+                points = polygon_arrays.get(shape_idx)
+                if points is None:
+                    points = polygon_arrays[shape_idx] = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+                scaled_coords = (points * scale + (x_offset, y_offset)).ravel().tolist()
                 
                 if highlighted:
                     # Draw beautiful cyan highlight for polygon
@@ -4177,12 +4728,10 @@ class LayoutTextLabeler:
                         tags="highlight"
                     )
                 else:
-                    preview_canvas.create_polygon(
-                        *scaled_coords,
-                        outline=shape.get("color", "#0000FF"),
-                        fill="",  # Explicitly no fill
-                        width=2,
-                        tags=f"shape_{shape_idx}"
+                    place_base_shape(
+                        shape_idx, preview_canvas.create_polygon,
+                        scaled_coords,
+                        shape.get("color", "#0000FF")
                     )
                     
             elif shape_type == "circle":
@@ -4211,12 +4760,10 @@ class LayoutTextLabeler:
                         tags="highlight"
                     )
                 else:
-                    preview_canvas.create_oval(
-                        x1, y1, x2, y2,
-                        outline=shape.get("color", "#0000FF"),
-                        fill="",  # Explicitly no fill
-                        width=2,
-                        tags=f"shape_{shape_idx}"
+                    place_base_shape(
+                        shape_idx, preview_canvas.create_oval,
+                        (x1, y1, x2, y2),
+                        shape.get("color", "#0000FF")
                     )
             
             elif shape_type == "oval":
@@ -4246,25 +4793,26 @@ class LayoutTextLabeler:
                         tags="highlight"
                     )
                 else:
-                    preview_canvas.create_oval(
-                        scaled_x1, scaled_y1, scaled_x2, scaled_y2,
-                        outline=shape.get("color", "#0000FF"),
-                        fill="",  # Explicitly no fill
-                        width=2,
-                        tags=f"shape_{shape_idx}"
+                    place_base_shape(
+                        shape_idx, preview_canvas.create_oval,
+                        (scaled_x1, scaled_y1, scaled_x2, scaled_y2),
+                        shape.get("color", "#0000FF")
                     )
         
         def highlight_shape(shape_idx):
             """Highlight a specific shape on the preview"""
+            # Clear previous highlight and show its base outline again
+            previous_idx = current_highlight["shape_idx"]
+            if previous_idx is not None:
+                preview_canvas.itemconfigure(f"shape_{previous_idx}", state="normal")
+            preview_canvas.delete("highlight")
+            
             # Update current highlight state
             current_highlight["shape_idx"] = shape_idx
             
-            # Clear previous highlight
-            preview_canvas.delete("highlight")
-            
             if shape_idx is not None and hasattr(preview_canvas, 'scale'):
-                # Delete the original shape to prevent overlap
-                preview_canvas.delete(f"shape_{shape_idx}")
+                # Hide the base shape to prevent overlap (the base layer stays intact)
+                preview_canvas.itemconfigure(f"shape_{shape_idx}", state="hidden")
                 
                 # Draw highlighted version
                 shape = shapes[shape_idx]
@@ -4276,18 +4824,13 @@ class LayoutTextLabeler:
                     highlighted=True
                 )
         
-        # Schedule initial draw
-        preview_canvas.after(100, draw_preview)
+        # Schedule initial draw (repeated by <Configure> once the canvas is mapped)
+        schedule_redraw()
         
         # RIGHT PANEL: Mapping controls
         right_panel = tk.Frame(main_container, bg="#ffffff", relief=tk.FLAT, bd=0)
         right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=False, padx=(10, 0))
         
-        # Add subtle shadow
-        shadow_frame = tk.Frame(main_container, bg="#d0d0d0")
-        shadow_frame.place(in_=right_panel, x=2, y=2, relwidth=1, relheight=1)
-        right_panel.lift()
-        
         # Header
         header_frame = tk.Frame(right_panel, bg="#ffffff")
         header_frame.pack(fill=tk.X, padx=15, pady=(15, 10))
@@ -4339,37 +4882,70 @@ class LayoutTextLabeler:
         
         # Prepare Excel row options
         first_col = df.columns[0]
-        excel_options = ["<None - Skip>"]
-        for idx, row in df.iterrows():
-            row_preview = str(row[first_col])[:40]
-            excel_options.append(f"Row {idx + 2}: {row_preview}")
+        # One column-wise pass instead of building a Series per row with iterrows();
+        # positions match the df.iloc lookups used when the mapping is applied
+        row_previews = df[first_col].astype(str).str.slice(0, 40).to_numpy()
+        excel_options = ["<None - Skip>"] + [f"Row {i + 2}: {preview}" for i, preview in enumerate(row_previews)]
+        
+        # Only one Combobox exists at a time: each row shows its selection in a plain
+        # label and swaps in the dropdown on click (S comboboxes x N options was the
+        # dominant cost of opening this dialog for large layouts)
+        active_combo = {"combo": None, "field": None, "open_id": None}
+        
+        def activate_combo(shape_idx, field):
+            if active_combo["field"] is field:
+                return
+            if active_combo["combo"] is not None:
+                # Cancel a dropdown-open still pending for the combo being swapped out
+                if active_combo["open_id"] is not None:
+                    active_combo["combo"].after_cancel(active_combo["open_id"])
+                    active_combo["open_id"] = None
+                active_combo["combo"].destroy()
+                active_combo["field"].pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 10))
+            
+            field.pack_forget()
+            combo = ttk.Combobox(
+                field.master,
+                textvariable=mapping_vars[shape_idx],
+                values=excel_options,
+                state="readonly",
+                width=38,
+                font=("Segoe UI", 9)
+            )
+            combo.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 10))
+            active_combo["combo"] = combo
+            active_combo["field"] = field
+            
+            # Open the list straight away so one click still picks a row
+            combo.focus_set()
+            def open_dropdown():
+                active_combo["open_id"] = None
+                if combo.winfo_exists():
+                    combo.event_generate("<Down>")
+            active_combo["open_id"] = combo.after_idle(open_dropdown)
         
         for shape_idx, shape in enumerate(shapes):
             shape_name = shape.get("name", f"Shape {shape_idx + 1}")
             
-            # Row frame with modern card styling
-            row_frame = tk.Frame(scrollable_frame, bg="#ffffff", relief=tk.FLAT, bd=0)
-            row_frame.pack(fill=tk.X, padx=8, pady=4)
-            
-            # Inner frame for border effect
-            inner_frame = tk.Frame(row_frame, bg="#ffffff", highlightthickness=1, highlightbackground="#e0e0e0")
-            inner_frame.pack(fill=tk.BOTH, expand=True)
+            # Row card: a single frame whose highlight ring is the border
+            inner_frame = tk.Frame(scrollable_frame, bg="#ffffff", highlightthickness=1, highlightbackground="#e0e0e0")
+            inner_frame.pack(fill=tk.X, padx=8, pady=4)
             
             # Make row clickable to highlight shape
             def make_click_handler(idx):
                 def on_click(event=None):
-                    highlight_shape(idx)
+                    schedule_highlight(idx)
                 return on_click
             
             # Hover effect
-            def make_hover_handlers(frame, inner):
+            def make_hover_handlers(inner):
                 def on_enter(e):
                     inner.config(highlightbackground="#3498db", highlightthickness=2)
                 def on_leave(e):
                     inner.config(highlightbackground="#e0e0e0", highlightthickness=1)
                 return on_enter, on_leave
             
-            on_enter, on_leave = make_hover_handlers(row_frame, inner_frame)
+            on_enter, on_leave = make_hover_handlers(inner_frame)
             inner_frame.bind("<Enter>", on_enter)
             inner_frame.bind("<Leave>", on_leave)
             inner_frame.bind("<Button-1>", make_click_handler(shape_idx))
@@ -4400,15 +4976,27 @@ class LayoutTextLabeler:
                 if excel_row_idx < len(excel_options) - 1:
                     var.set(excel_options[excel_row_idx + 1])
             
-            combo = ttk.Combobox(
+            # Lightweight stand-in for the dropdown until the row is clicked
+            field = tk.Label(
                 inner_frame,
                 textvariable=var,
-                values=excel_options,
-                state="readonly",
-                width=38,
-                font=("Segoe UI", 9)
+                font=("Segoe UI", 9),
+                bg="#f8f9fa",
+                relief=tk.SOLID,
+                bd=1,
+                anchor="w",
+                padx=4,
+                cursor="hand2"
             )
-            combo.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 10))
+            field.pack(side=tk.TOP, fill=tk.X, padx=10, pady=(0, 10))
+            
+            def make_field_handler(idx, field):
+                def on_field_click(event=None):
+                    schedule_highlight(idx)
+                    activate_combo(idx, field)
+                return on_field_click
+            
+            field.bind("<Button-1>", make_field_handler(shape_idx, field))
         
         # Buttons at bottom with modern styling
         btn_frame = tk.Frame(right_panel, bg="#ffffff")
@@ -4445,14 +5033,9 @@ class LayoutTextLabeler:
             # Build mapping from selections
             mapping = {}
             for shape_idx, var in mapping_vars.items():
-                selection = var.get()
-                if selection != "<None - Skip>":
-                    try:
-                        row_num_str = selection.split(":")[0].replace("Row ", "")
-                        excel_row_idx = int(row_num_str) - 2
-                        mapping[shape_idx] = excel_row_idx
-                    except:
-                        pass
+                match = _ROW_OPTION_RE.match(var.get())  # "<None - Skip>" simply doesn't match
+                if match:
+                    mapping[shape_idx] = int(match.group(1)) - 2
             
             mapping_result["cancelled"] = False
             mapping_result["mapping"] = mapping
@@ -4491,10 +5074,8 @@ class LayoutTextLabeler:
             # Read file based on extension
             file_ext = os.path.splitext(file_path)[1].lower()
             
-            if file_ext == '.csv':
-                df = pd.read_csv(file_path)
-            elif file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
+            if file_ext in ['.csv', '.xlsx', '.xls']:
+                df = _read_table_file(file_path)
             else:
                 messagebox.showerror("Error", "Unsupported file format. Please use .csv or .xlsx files")
                 return
@@ -4527,6 +5108,74 @@ class LayoutTextLabeler:
             messagebox.showerror("Error", f"Error importing file: {str(e)}")
             self.status_var.set("Import failed")
     
+    def _compute_shape_bounds(self) -> np.ndarray:
+        """Axis-aligned bounds of every shape as an (N, 4) array of left, top, right, bottom
+        
+        Shapes without a known geometry collapse to their center point; malformed
+        shapes get a NaN row so one bad entry doesn't fail the batch. Built fresh by
+        callers that need it for a batch (shapes are shared with, and edited in place
+        by, the heatmap tab, so a long-lived cache could go stale).
+        """
+        bounds = np.empty((len(self.shapes), 4), dtype=np.float64)
+        for i, shape in enumerate(self.shapes):
+            try:
+                shape_type = shape["type"]
+                coords = shape["coordinates"]
+                if shape_type == "rectangle":
+                    x1, y1, x2, y2 = coords
+                    bounds[i] = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+                elif shape_type == "polygon":
+                    points = np.asarray(coords, dtype=np.float64)
+                    xs, ys = points[::2], points[1::2]
+                    bounds[i] = (xs.min(), ys.min(), xs.max(), ys.max())
+                elif shape_type == "circle":
+                    cx, cy, radius = coords
+                    bounds[i] = (cx - radius, cy - radius, cx + radius, cy + radius)
+                else:
+                    # Fallback
+                    cx, cy = self.get_shape_center(shape)
+                    bounds[i] = (cx, cy, cx, cy)
+            except:
+                bounds[i] = np.nan
+        return bounds
+    
+    def _apply_import_row(self, label: TextLabel, shape_name: str, name_var: str,
+                          data_values: list, line_defaults: tuple, is_new: bool) -> int:
+        """Write one imported row into a label in a single pass
+        
+        data_values holds value1, var1, value2, var2, ... (empty values are skipped).
+        A new label gets its name line and all value lines at once; an existing label
+        gets its name variable updated and the value lines appended.
+        Returns the number of value lines added.
+        """
+        font_size, font_color, bg_color = line_defaults
+        new_lines = [(value, var_name)
+                     for value, var_name in zip(data_values[::2], data_values[1::2])
+                     if value]
+        lines_added = len(new_lines)
+        new_texts = [value for value, _ in new_lines]
+        new_vars = [var_name for _, var_name in new_lines]
+        
+        if is_new:
+            # Imported name from Excel (not the shape name) is the first line, with its variable
+            label.text_lines = [shape_name, *new_texts]
+            label.line_variables = [name_var, *new_vars]
+            label.line_font_sizes = [font_size] * (lines_added + 1)
+            label.line_font_colors = [font_color] * (lines_added + 1)
+            label.line_bg_colors = [bg_color] * (lines_added + 1)
+        else:
+            # Update existing label's name variable, then append the new lines
+            if len(label.line_variables) > 0:
+                label.line_variables[0] = name_var
+            if lines_added:
+                label.text_lines.extend(new_texts)
+                label.line_variables.extend(new_vars)
+                label.line_font_sizes.extend([font_size] * lines_added)
+                label.line_font_colors.extend([font_color] * lines_added)
+                label.line_bg_colors.extend([bg_color] * lines_added)
+        
+        return lines_added
+    
     def apply_import_data_with_mapping(self, df, mapping):
         """Apply imported Excel/CSV data using the provided mapping
         
@@ -4534,11 +5183,8 @@ class LayoutTextLabeler:
         """
         try:
             
-            # First two columns are name and variable for name
-            name_column = df.columns[0]
-            name_var_column = df.columns[1]
-            
-            # Remaining columns should be value/variable pairs
+            # First two columns are name and variable for name;
+            # remaining columns should be value/variable pairs
             data_columns = df.columns[2:]
             
             if len(data_columns) % 2 != 0:
@@ -4553,16 +5199,75 @@ class LayoutTextLabeler:
             success_count = 0
             total_lines_added = 0
             
+            # New-line formatting defaults, read from the Tk variables once per import
+            default_size = self.default_text_size.get() if hasattr(self, 'default_text_size') else 30
+            default_color = self.default_text_color.get() if hasattr(self, 'default_text_color') else "#000000"
+            default_bg = self.default_bg_color.get() if hasattr(self, 'default_bg_color') else "#FFFFFF"
+            default_leader_width = self.default_leader_width.get() if hasattr(self, 'default_leader_width') else None
+            line_defaults = (default_size, default_color, default_bg)
+            
+            # Bounds of every shape, computed once per import rather than per new label
+            shape_bounds = self._compute_shape_bounds()
+            
+            # Get PDF bounds (default PDF size estimate when no PDF is loaded)
+            pdf_image = getattr(self, 'pdf_image', None)
+            pdf_width, pdf_height = pdf_image.size if pdf_image else (800, 1000)
+            margin = 50  # Distance outside PDF for new labels
+            
+            # Closest PDF edge per shape: 0 = left, 1 = right, 2 = top, 3 = bottom
+            # (argmin takes the first of equal distances, same order as before)
+            edge_distances = np.stack([
+                shape_bounds[:, 0],
+                pdf_width - shape_bounds[:, 2],
+                shape_bounds[:, 1],
+                pdf_height - shape_bounds[:, 3],
+            ], axis=1)
+            closest_edge = edge_distances.argmin(axis=1).tolist()
+            
+            # Clean every column once up front instead of per mapped cell
+            def clean_text(column, missing):
+                """Stripped cell text, with missing cells replaced by `missing`"""
+                # Nullable string dtype keeps missing cells as NA through the strip,
+                # so they are never stringified just to be masked out again
+                return column.astype('string').str.strip().fillna(missing)
+            
+            def format_values(column):
+                """Cleaned value text; numbers get thousand separators, no decimals (accounting style)"""
+                text = clean_text(column, "")
+                numbers = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce').astype(np.float64)
+                is_number = np.isfinite(numbers)
+                return text.mask(is_number, numbers[is_number].map(lambda num: f"{int(num):,}"))
+            
+            cleaned = [df.iloc[:, 0].astype(str).str.strip(), clean_text(df.iloc[:, 1], "None")]
+            for pair_start in range(2, 2 + len(data_columns) - 1, 2):
+                cleaned.append(format_values(df.iloc[:, pair_start]))
+                cleaned.append(clean_text(df.iloc[:, pair_start + 1], "None"))
+            
+            # Cleaned columns as object arrays, indexed by position like df.iloc. Only the
+            # mapped rows are ever touched, so sparse mappings over big sheets stay cheap
+            # (no Series, and no per-row tuple built for unmapped rows)
+            name_arr = cleaned[0].to_numpy(dtype=object)
+            namevar_arr = cleaned[1].to_numpy(dtype=object)
+            if len(cleaned) > 2:
+                data_arr = np.column_stack([column.to_numpy(dtype=object) for column in cleaned[2:]])
+            else:
+                data_arr = np.empty((len(df), 0), dtype=object)
+            
+            # Shape index -> its (first) label, kept current as labels are created
+            label_by_shape = {label.shape_index: label for label in reversed(self.labels)}
+            
+            # (label, shape, bounds row, is_new) for labels that got new lines or were created
+            touched_labels = []
+            
             for shape_index, excel_row_idx in mapping.items():
                 try:
                     # Get the Excel row
-                    row = df.iloc[excel_row_idx]
-                    
-                    shape_name = str(row[name_column]).strip()
-                    name_var = str(row[name_var_column]).strip() if not pd.isna(row[name_var_column]) else "None"
+                    shape_name = name_arr[excel_row_idx]
+                    name_var = namevar_arr[excel_row_idx]
+                    data_values = data_arr[excel_row_idx].tolist()  # value1, var1, value2, var2, ...
                     
                     # Find or create label
-                    label = self.find_label_for_shape(shape_index)
+                    label = label_by_shape.get(shape_index)
                     
                     if label is None:
                         # Create new label OUTSIDE PDF bounds on closest side
@@ -4572,132 +5277,36 @@ class LayoutTextLabeler:
                         center = self.get_shape_center(shape)
                         shape_x, shape_y = center
                         
-                        # Get shape bounds to determine closest edge
-                        if shape["type"] == "rectangle":
-                            coords = shape["coordinates"]
-                            x1, y1, x2, y2 = coords
-                            shape_left = min(x1, x2)
-                            shape_right = max(x1, x2)
-                            shape_top = min(y1, y2)
-                            shape_bottom = max(y1, y2)
-                        elif shape["type"] == "polygon":
-                            coords = shape["coordinates"]
-                            x_coords = coords[::2]
-                            y_coords = coords[1::2]
-                            shape_left = min(x_coords)
-                            shape_right = max(x_coords)
-                            shape_top = min(y_coords)
-                            shape_bottom = max(y_coords)
-                        elif shape["type"] == "circle":
-                            coords = shape["coordinates"]
-                            cx, cy, radius = coords
-                            shape_left = cx - radius
-                            shape_right = cx + radius
-                            shape_top = cy - radius
-                            shape_bottom = cy + radius
-                        else:
-                            # Fallback
-                            shape_left = shape_right = shape_x
-                            shape_top = shape_bottom = shape_y
-                        
-                        # Get PDF bounds
-                        if hasattr(self, 'pdf_image') and self.pdf_image:
-                            pdf_width = self.pdf_image.width
-                            pdf_height = self.pdf_image.height
-                        else:
-                            # Default PDF size estimate
-                            pdf_width = 800
-                            pdf_height = 1000
-                        
-                        # Calculate distances to each edge
-                        dist_to_left = shape_left
-                        dist_to_right = pdf_width - shape_right
-                        dist_to_top = shape_top
-                        dist_to_bottom = pdf_height - shape_bottom
+                        # Malformed shapes have NaN bounds (see _compute_shape_bounds)
+                        if np.isnan(shape_bounds[shape_index, 0]):
+                            raise ValueError("invalid shape coordinates")
                         
-                        # Find closest edge
-                        min_dist = min(dist_to_left, dist_to_right, dist_to_top, dist_to_bottom)
-                        
-                        # Place label outside PDF on closest side
-                        margin = 50  # Distance outside PDF
-                        
-                        if min_dist == dist_to_left:
-                            # Place to the left of PDF
-                            label_x = -margin
-                            label_y = shape_y
-                        elif min_dist == dist_to_right:
-                            # Place to the right of PDF
-                            label_x = pdf_width + margin
-                            label_y = shape_y
-                        elif min_dist == dist_to_top:
-                            # Place above PDF
-                            label_x = shape_x
-                            label_y = -margin
-                        else:  # dist_to_bottom
-                            # Place below PDF
-                            label_x = shape_x
-                            label_y = pdf_height + margin
+                        # Place label outside PDF on closest side (edge chosen up front)
+                        edge = closest_edge[shape_index]
+                        label_x = (-margin, pdf_width + margin, shape_x, shape_x)[edge]
+                        label_y = (shape_y, shape_y, -margin, pdf_height + margin)[edge]
                         
                         label = TextLabel(shape_index, (label_x, label_y))
                         
-                        # Set imported name from Excel as first line with its variable
-                        label.text_lines = [shape_name]  # Use imported name from Excel, not shape name
-                        label.line_font_sizes = [self.default_text_size.get() if hasattr(self, 'default_text_size') else 30]
-                        label.line_font_colors = [self.default_text_color.get() if hasattr(self, 'default_text_color') else "#000000"]
-                        label.line_bg_colors = [self.default_bg_color.get() if hasattr(self, 'default_bg_color') else "#FFFFFF"]
-                        label.line_variables = [name_var]  # Assign variable to name line
-                        
                         # Set default leader line width
-                        if hasattr(self, 'default_leader_width'):
-                            label.leader_width = self.default_leader_width.get()
+                        if default_leader_width is not None:
+                            label.leader_width = default_leader_width
                         
-                        # Always add leader line since label is outside shape
-                        label.has_leader = True
-                        label.leader_points = self.calculate_leader_line((label_x, label_y), shape)
+                        # Leader line is always added (label is outside shape); its points are
+                        # computed in the batch pass after the loop
                         
                         self.labels.append(label)
+                        label_by_shape[shape_index] = label
+                        is_new = True
                     else:
-                        # Update existing label's name variable
-                        if len(label.line_variables) > 0:
-                            label.line_variables[0] = name_var
+                        is_new = False
                     
-                    # Process value/variable pairs
-                    lines_added = 0
-                    for i in range(0, len(data_columns) - 1, 2):
-                        value_col = data_columns[i]
-                        var_col = data_columns[i + 1]
-                        
-                        value = str(row[value_col]).strip() if not pd.isna(row[value_col]) else ""
-                        var_name = str(row[var_col]).strip() if not pd.isna(row[var_col]) else "None"
-                        
-                        # Skip if value is empty
-                        if not value:
-                            continue
-                        
-                        # Format number with thousand separators (accounting style)
-                        try:
-                            # Try to parse as number
-                            num_value = float(value.replace(',', ''))  # Remove existing commas
-                            # Format with thousand separators, no decimals
-                            formatted_value = f"{int(num_value):,}"
-                        except (ValueError, AttributeError):
-                            # If not a number, use as-is
-                            formatted_value = value
-                        
-                        # Add new text line with formatted value and variable
-                        label.text_lines.append(formatted_value)
-                        label.line_font_sizes.append(self.default_text_size.get() if hasattr(self, 'default_text_size') else 30)
-                        label.line_font_colors.append(self.default_text_color.get() if hasattr(self, 'default_text_color') else "#000000")
-                        label.line_bg_colors.append(self.default_bg_color.get() if hasattr(self, 'default_bg_color') else "#FFFFFF")
-                        label.line_variables.append(var_name)
-                        lines_added += 1
+                    # Name line and value/variable pairs (already cleaned and formatted above)
+                    lines_added = self._apply_import_row(label, shape_name, name_var, data_values, line_defaults, is_new)
                     
-                    # Check if text is outside shape and update leader line
-                    if lines_added > 0 or label not in self.labels:
-                        shape = self.shapes[shape_index]
-                        if not self.is_point_in_shape(label.position, shape):
-                            label.has_leader = True
-                            label.leader_points = self.calculate_leader_line(label.position, shape)
+                    # Leader line is checked for all touched labels after the loop
+                    if lines_added > 0 or is_new:
+                        touched_labels.append((label, self.shapes[shape_index], shape_bounds[shape_index], is_new))
                         
                         success_count += 1
                         total_lines_added += lines_added
@@ -4706,13 +5315,47 @@ class LayoutTextLabeler:
                     print(f"Error processing shape {shape_index}: {e}")
                     continue
             
+            # Check if text is outside shape and update leader line, for all touched labels
+            # at once: a vectorized bounding-box test settles rectangles exactly and rejects
+            # most outside points for polygons/circles; only the rest need the exact test.
+            # New labels always get a leader (they are placed outside the PDF).
+            if touched_labels:
+                positions = np.array([label.position for label, _, _, _ in touched_labels], dtype=np.float64)
+                bounds = np.array([row for _, _, row, _ in touched_labels])
+                in_bbox = ((bounds[:, 0] <= positions[:, 0]) & (positions[:, 0] <= bounds[:, 2]) &
+                           (bounds[:, 1] <= positions[:, 1]) & (positions[:, 1] <= bounds[:, 3])).tolist()
+                
+                # Nearest point on each rectangle = the position clamped into its bounds,
+                # computed for all rows in one pass (only used for rectangle rows)
+                with np.errstate(invalid='ignore'):
+                    clamped = np.stack([np.clip(positions[:, 0], bounds[:, 0], bounds[:, 2]),
+                                        np.clip(positions[:, 1], bounds[:, 1], bounds[:, 3])], axis=1).tolist()
+                valid_bounds = np.isfinite(bounds).all(axis=1).tolist()
+                
+                for k, (label, shape, _, is_new) in enumerate(touched_labels):
+                    try:
+                        shape_type = shape.get("type")
+                        if shape_type == "rectangle" or (shape_type in ("polygon", "circle") and not in_bbox[k]):
+                            inside = in_bbox[k]
+                        else:
+                            inside = self.is_point_in_shape(label.position, shape)
+                        
+                        if is_new or not inside:
+                            label.has_leader = True
+                            if shape_type == "rectangle" and valid_bounds[k]:
+                                label.leader_points = [list(label.position), clamped[k]]
+                            else:
+                                label.leader_points = self.calculate_leader_line(label.position, shape)
+                    except Exception as e:
+                        print(f"Error processing shape {label.shape_index}: {e}")
+            
             # Show results
             result_message = f"Successfully imported {success_count} label(s)\n"
             result_message += f"Added {total_lines_added} text line(s)"
             
-            # Update display
-            self.display_canvas()
-            self.update_shape_list()
+            # Update display (canvas redraw is coalesced; only the mapped list rows change)
+            self._schedule_redraw()
+            self.update_shape_list(dirty_shape_indices=set(mapping))
             
             messagebox.showinfo("Import Complete", result_message)
             self.status_var.set(f"Imported {success_count} labels successfully")
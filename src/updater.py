@@ -9,14 +9,23 @@ import requests
 import json
 import os
 import sys
+import shutil
 import zipfile
 import tempfile
 import subprocess
 import threading
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
 from version import __version__, __github_repo__
 
+try:
+    from packaging.version import Version, InvalidVersion  # Optional: PEP 440 version comparison
+except ImportError:
+    Version = None
+
+# Seconds between automatic update checks (once per day)
+UPDATE_CHECK_INTERVAL = 24 * 60 * 60
+
 
 class UpdateChecker:
     def __init__(self, parent=None):
@@ -24,35 +33,72 @@ class UpdateChecker:
         self.github_repo = __github_repo__
         self.current_version = __version__
         self.last_check_file = Path(tempfile.gettempdir()) / "layout_heatmap_last_check.txt"
+        # Last release JSON and its ETag, for conditional (If-None-Match) requests
+        self.cache_file = Path(tempfile.gettempdir()) / "layout_heatmap_release.json"
+        self.etag_file = Path(tempfile.gettempdir()) / "layout_heatmap_release.etag"
         
     def should_check_for_updates(self):
-        """Check if we should check for updates (once per day)"""
-        if not self.last_check_file.exists():
-            return True
+        """Check if we should check for updates (once per day)
         
+        The marker file's modification time is the last check time, so no read/parse is needed.
+        """
         try:
-            with open(self.last_check_file, 'r') as f:
-                last_check = datetime.fromisoformat(f.read().strip())
-                return datetime.now() - last_check > timedelta(days=1)
-        except:
+            return time.time() - os.stat(self.last_check_file).st_mtime > UPDATE_CHECK_INTERVAL
+        except OSError:
             return True
     
     def mark_update_checked(self):
         """Mark that we've checked for updates"""
         try:
-            with open(self.last_check_file, 'w') as f:
-                f.write(datetime.now().isoformat())
+            self.last_check_file.touch()
+        except:
+            pass
+    
+    def _load_cached_release(self):
+        """Return the cached release JSON, or None if there is no usable cache"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            return None
+    
+    def _save_cached_release(self, release_info, etag):
+        """Remember the release JSON and its ETag for the next conditional request"""
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(release_info, f)
+            with open(self.etag_file, 'w') as f:
+                f.write(etag)
         except:
             pass
     
     def get_latest_release(self):
-        """Fetch latest release info from GitHub"""
+        """Fetch latest release info from GitHub
+        
+        Sends the ETag of the cached release, so an unchanged release comes back
+        as an empty 304 and is served from the cache.
+        """
         try:
             url = f"https://api.github.com/repos/{self.github_repo}/releases/latest"
-            response = requests.get(url, timeout=5)
             
+            headers = {}
+            cached_release = self._load_cached_release()
+            if cached_release is not None:
+                try:
+                    headers["If-None-Match"] = self.etag_file.read_text().strip()
+                except OSError:
+                    pass
+            
+            response = requests.get(url, headers=headers, timeout=5)
+            
+            if response.status_code == 304 and cached_release is not None:
+                return cached_release
             if response.status_code == 200:
-                return response.json()
+                release_info = response.json()
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._save_cached_release(release_info, etag)
+                return release_info
             return None
         except Exception as e:
             print(f"Error checking for updates: {e}")
@@ -64,7 +110,14 @@ class UpdateChecker:
         latest = latest_version.lstrip('v')
         current = self.current_version.lstrip('v')
         
-        # Split into major.minor.patch
+        # PEP 440 parse handles pre/post-release suffixes like "1.0.1rc1" or "1.0.1.post2"
+        if Version is not None:
+            try:
+                return Version(latest) > Version(current)
+            except InvalidVersion:
+                return False
+        
+        # Fallback: split into major.minor.patch
         try:
             latest_parts = [int(x) for x in latest.split('.')]
             current_parts = [int(x) for x in current.split('.')]
@@ -259,10 +312,11 @@ class UpdateChecker:
                 
                 status_label.config(text="Downloading...")
                 response = requests.get(download_url, stream=True)
+                response.raw.decode_content = True  # Undo any Content-Encoding, as iter_content did
                 
+                # Copy in 1 MiB blocks inside shutil rather than an 8 KiB Python loop
                 with open(zip_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
                 
                 status_label.config(text="Extracting...")
                 
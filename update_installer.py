@@ -8,6 +8,7 @@ import os
 import shutil
 import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 
@@ -16,6 +17,22 @@ def show_progress(message):
     print(f"[UPDATE] {message}")
 
 
+def link_or_copy(src, dst):
+    """Hard-link src at dst (no bytes copied); fall back to a real copy where links aren't possible"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def restore_file(src, dst):
+    """Copy a backed-up file back, skipping files that are still hard links to the same data"""
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return dst
+    return shutil.copy2(src, dst)
+
+
 def install_update(source_dir, target_dir):
     """Install update by replacing files"""
     try:
@@ -36,7 +53,9 @@ def install_update(source_dir, target_dir):
         show_progress("Creating backup of current version...")
         backup_dir.mkdir(exist_ok=True)
         
-        # Copy important files to backup
+        # Copy important files to backup (folders are hard-linked file by file, which is
+        # instant and takes no extra space; the database is copied because SQLite
+        # writes it in place, which would change a linked backup too)
         important_files = ['layout_projects.db', 'data', 'examples']
         for item in important_files:
             item_path = target_path / item
@@ -44,31 +63,40 @@ def install_update(source_dir, target_dir):
                 if item_path.is_file():
                     shutil.copy2(item_path, backup_dir / item)
                 else:
-                    shutil.copytree(item_path, backup_dir / item, dirs_exist_ok=True)
+                    shutil.copytree(item_path, backup_dir / item, copy_function=link_or_copy, dirs_exist_ok=True)
         
         show_progress("Installing new version...")
         
         # Files/folders to skip during copy (user data that will be restored later)
         skip_items = {'layout_projects.db', 'data', 'examples', 'backup_old_version'}
         
-        # Copy new files
-        for item in source_path.rglob('*'):
-            if item.is_file():
-                # Get relative path
-                rel_path = item.relative_to(source_path)
-                
-                # Skip user data files - they will be restored from backup
-                if rel_path.parts[0] in skip_items:
-                    continue
-                
-                target_file = target_path / rel_path
-                
-                # Create parent directory if needed
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Copy file
+        # Collect new files in one os.walk (directory entries come with their type, so
+        # there is no extra stat per entry); target directories are created up front
+        copy_jobs = []
+        for dir_path, dir_names, file_names in os.walk(source_path):
+            rel_dir = Path(dir_path).relative_to(source_path)
+            
+            # Skip user data files - they will be restored from backup
+            if rel_dir == Path('.'):
+                dir_names[:] = [name for name in dir_names if name not in skip_items]
+                file_names = [name for name in file_names if name not in skip_items]
+            
+            if file_names:
+                (target_path / rel_dir).mkdir(parents=True, exist_ok=True)
+            for name in file_names:
+                copy_jobs.append((Path(dir_path) / name, rel_dir / name))
+        
+        # Copy files in parallel (I/O bound, so threads overlap the disk waits)
+        max_workers = min(16, (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(shutil.copy2, source_file, target_path / rel_path): rel_path
+                for source_file, rel_path in copy_jobs
+            }
+            for future in as_completed(futures):
+                rel_path = futures[future]
                 try:
-                    shutil.copy2(item, target_file)
+                    future.result()
                     show_progress(f"Updated: {rel_path}")
                 except Exception as e:
                     show_progress(f"Warning: Could not update {rel_path}: {e}")
@@ -80,9 +108,9 @@ def install_update(source_dir, target_dir):
             if backup_item.exists():
                 target_item = target_path / item
                 if backup_item.is_file():
-                    shutil.copy2(backup_item, target_item)
+                    restore_file(backup_item, target_item)
                 else:
-                    shutil.copytree(backup_item, target_item, dirs_exist_ok=True)
+                    shutil.copytree(backup_item, target_item, copy_function=restore_file, dirs_exist_ok=True)
         
         show_progress("Update completed successfully!")
         